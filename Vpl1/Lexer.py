@@ -1,5 +1,7 @@
 import sys
+import re
 import enum
+import functools
 
 class Token:
     """
@@ -15,7 +17,7 @@ class Token:
         self.kind = tokenKind
 
 
-class TokenType(enum.Enum):
+class TokenType(enum.IntEnum):
     """
     These are the possible tokens. You don't need to change this class at all.
     """
@@ -43,6 +45,97 @@ class TokenType(enum.Enum):
     RPR = 211
 
 
+# Character classes used by the scanners. Each entry of _TBL, indexed by a
+# byte, is a bit set of the classes that the byte belongs to.
+_DIGIT = 1
+_ALNUM = 2
+_HEXDIGIT = 4
+_OCTDIGIT = 8
+_BINDIGIT = 16
+
+
+def _build_char_classes():
+    table = bytearray(256)
+    for code in range(128):
+        char = chr(code)
+        if char.isdigit():
+            table[code] |= _DIGIT
+        if char.isalnum():
+            table[code] |= _ALNUM
+        if char in "0123456789abcdefABCDEF":
+            table[code] |= _HEXDIGIT
+        if char in "01234567":
+            table[code] |= _OCTDIGIT
+        if char in "01":
+            table[code] |= _BINDIGIT
+    return bytes(table)
+
+
+_TBL = _build_char_classes()
+
+
+# A single pattern that recognizes every token of the language. The regex
+# engine tries the alternatives in order, so they are sorted by how often
+# they occur in programs: whitespace first, then numbers and the common
+# operators, with the keywords and '~' last. Alternatives that share a prefix
+# keep their relative order (comments before '-' and '(', '<=' before '<').
+# A number must not run into a letter or digit outside of its radix; the BAD
+# group catches such numbers. The UNT group catches a '(*' that is never
+# closed, and the ERR group any character that starts no token.
+_TOKEN_RE = re.compile(r"""
+    (?P<WSP>[ \n]+)
+  | (?P<BIN>0[bB][01]+(?![A-Za-z0-9]))
+  | (?P<HEX>0[xX][0-9A-Fa-f]+(?![A-Za-z0-9]))
+  | (?P<OCT>0[0-7]+(?![A-Za-z0-9]))
+  | (?P<INT>(?:[1-9][0-9]*|0)(?![A-Za-z0-9]))
+  | (?P<BAD>[0-9][A-Za-z0-9]*)
+  | (?P<COM>--[^\n]*|\(\*.*?\*\))
+  | (?P<UNT>\(\*)
+  | (?P<ADD>\+) | (?P<SUB>-) | (?P<MUL>\*) | (?P<LPR>\() | (?P<RPR>\))
+  | (?P<EQL>=) | (?P<DIV>/) | (?P<LEQ><=) | (?P<LTH><)
+  | (?P<NOT>not)
+  | (?P<TRU>true)
+  | (?P<FLS>false)
+  | (?P<NEG>~)
+  | (?P<ERR>.)
+""", re.VERBOSE | re.DOTALL)
+
+# Runs of blanks that getToken skips before scanning a token.
+_BLANKS_RE = re.compile(r"[ \n]+")
+
+# Tokens whose text is fixed are built once and shared by every lexer. The
+# consumers of this module only read tokens, so sharing them is safe.
+_EOF_TOK = Token("", TokenType.EOF)
+_EQL_TOK = Token("=", TokenType.EQL)
+_ADD_TOK = Token("+", TokenType.ADD)
+_SUB_TOK = Token("-", TokenType.SUB)
+_MUL_TOK = Token("*", TokenType.MUL)
+_DIV_TOK = Token("/", TokenType.DIV)
+_LEQ_TOK = Token("<=", TokenType.LEQ)
+_LTH_TOK = Token("<", TokenType.LTH)
+_NEG_TOK = Token("~", TokenType.NEG)
+_NOT_TOK = Token("not", TokenType.NOT)
+_LPR_TOK = Token("(", TokenType.LPR)
+_RPR_TOK = Token(")", TokenType.RPR)
+_TRU_TOK = Token("true", TokenType.TRU)
+_FLS_TOK = Token("false", TokenType.FLS)
+
+_KIND_BY_GROUPNAME = {
+    "INT": TokenType.INT,
+    "BIN": TokenType.BIN,
+    "OCT": TokenType.OCT,
+    "HEX": TokenType.HEX,
+    "COM": TokenType.COM,
+}
+
+_TOKEN_BY_GROUPNAME = {
+    tok.kind.name: tok
+    for tok in (_EQL_TOK, _ADD_TOK, _SUB_TOK, _MUL_TOK, _DIV_TOK, _LEQ_TOK,
+                _LTH_TOK, _NEG_TOK, _NOT_TOK, _LPR_TOK, _RPR_TOK, _TRU_TOK,
+                _FLS_TOK)
+}
+
+
 class Lexer:
     
     def __init__(self, source):
@@ -54,6 +147,10 @@ class Lexer:
         self.source = source
         self.position = 0
         self.length = len(source)
+        # Non-ASCII characters become '?', which belongs to no class, so the
+        # buffer stays aligned with the source.
+        self.buf = source.encode("ascii", "replace")
+        self._dispatch = self._build_dispatch()
 
     def tokens(self):
         """
@@ -103,94 +200,200 @@ class Lexer:
         >>> l = Lexer('1 * 2 -3 -- alkdjf adkjf dlkjf \\n0x23 + 012')
         >>> [tk.kind.name for tk in l.tokens()]
         ['INT', 'MUL', 'INT', 'SUB', 'INT', 'COM', 'HEX', 'ADD', 'OCT']
+
+        >>> l = Lexer("0b12")
+        >>> [tk.kind.name for tk in l.tokens()]
+        Traceback (most recent call last):
+        ...
+        ValueError: Invalid number: 0b12
+
+        >>> l = Lexer('not true = false')
+        >>> [tk.text for tk in l.tokens()]
+        ['not', 'true', '=', 'false']
         """
-        token = self.getToken()
-        while token.kind != TokenType.EOF:
-            if token.kind != TokenType.WSP and token.kind != TokenType.NLN:
+        token_by_group = _TOKEN_BY_GROUPNAME
+        kind_by_group = _KIND_BY_GROUPNAME
+        for match in _TOKEN_RE.finditer(self.source):
+            group = match.lastgroup
+            token = token_by_group.get(group)
+            if token is not None:
                 yield token
-            token = self.getToken()
+                continue
+            kind = kind_by_group.get(group)
+            if kind is not None:
+                yield Token(match.group(), kind)
+            elif group == "BAD":
+                raise ValueError(f"Invalid number: {match.group()}")
+            elif group == "UNT":
+                raise ValueError("Unterminated (* comment")
+            elif group == "ERR":
+                raise ValueError(f"Unexpected character: {match.group()}")
+        self.position = self.length
+
+    def tokenize_all(self):
+        """
+        Returns the same tokens as the 'tokens' generator, but as a list, for
+        callers that need every token at once. Example:
+
+        >>> l = Lexer('1 + 0x2 -- three')
+        >>> [(tk.text, tk.kind.name) for tk in l.tokenize_all()]
+        [('1', 'INT'), ('+', 'ADD'), ('0x2', 'HEX'), ('-- three', 'COM')]
+        """
+        return list(self.tokens())
 
     def getToken(self):
         """
         Return the next token.
-        TODO: Implement this method!
+
+        Blanks (spaces and new lines) are skipped before the token is scanned,
+        so getToken never produces WSP or NLN tokens. The first byte of the
+        token selects its scanner through a 128-entry table, so each token
+        costs a single list lookup instead of a chain of comparisons. Scanners
+        compare byte values and only slice the source when they build the
+        token text.
+
+        The 'tokens' generator does not go through this method: it runs the
+        whole scan inside the regex engine, which is faster when every token
+        is wanted. getToken stays the interface for callers that pull one
+        token at a time, and it scans with the table above. The two scanners
+        are independent, so they must agree on every input:
+
+        >>> src = "not (0x1F + 017) <= 0b101 * 42 / ~7 -- c\\n(* d *) true = false"
+        >>> expected = [(tk.text, tk.kind) for tk in Lexer(src).tokens()]
+        >>> l = Lexer(src)
+        >>> [(tk.text, tk.kind) for tk in iter(l.getToken, _EOF_TOK)] == expected
+        True
+
+        >>> for src in ("1 + 0b12", "3 (* open", "2 @ 3"):
+        ...     for scan in (lambda l: list(l.tokens()),
+        ...                  lambda l: list(iter(l.getToken, _EOF_TOK))):
+        ...         try:
+        ...             scan(Lexer(src))
+        ...         except ValueError as e:
+        ...             print(e)
+        Invalid number: 0b12
+        Invalid number: 0b12
+        Unterminated (* comment
+        Unterminated (* comment
+        Unexpected character: @
+        Unexpected character: @
+        """
+
+        buf = self.buf
+        pos = self.position
+        if pos < self.length and (buf[pos] == 0x20 or buf[pos] == 0x0a):
+            pos = _BLANKS_RE.match(self.source, pos).end()
+        if pos >= self.length:
+            self.position = pos
+            return _EOF_TOK
+
+        b = buf[pos]
+        self.position = pos + 1
+        return self._dispatch[b](b)
+
+    def _build_dispatch(self):
+        """
+        Builds the table that maps the first byte of a token to the method
+        that scans that token.
+        """
+        dispatch = [self._lex_default] * 128
+        for digit in range(0x30, 0x3a):
+            dispatch[digit] = self._lex_number
+        dispatch[0x2d] = self._lex_dash
+        dispatch[0x28] = self._lex_lparen
+        dispatch[0x3c] = self._lex_less
+        dispatch[0x6e] = self._lex_n
+        dispatch[0x74] = self._lex_t
+        dispatch[0x66] = self._lex_f
+        singles = (_EQL_TOK, _ADD_TOK, _MUL_TOK, _DIV_TOK, _NEG_TOK, _RPR_TOK)
+        for token in singles:
+            dispatch[ord(token.text)] = functools.partial(self._lex_single, token)
+        return dispatch
+
+    def _lex_default(self, b):
+        # Report the source character: non-ASCII characters are '?' in buf.
+        current_char = self.source[self.position - 1]
+        raise ValueError(f"Unexpected character: {current_char}")
+
+    def _lex_single(self, token, b):
+        return token
+
+    def _lex_number(self, b):
+        """
+        Scans a number. The first two characters select the radix, and then
+        only digits of that radix are consumed. A number without digits after
+        its prefix, or followed by a letter or another digit, is invalid.
         """
+        buf = self.buf
+        n = self.length
+        start = self.position - 1
+        pos = self.position
+        nxt = buf[pos] if pos < n else 0
+        if b != 0x30:
+            kind, mask = TokenType.INT, _DIGIT
+        elif nxt == 0x62 or nxt == 0x42:
+            kind, mask = TokenType.BIN, _BINDIGIT
+            pos += 1
+        elif nxt == 0x78 or nxt == 0x58:
+            kind, mask = TokenType.HEX, _HEXDIGIT
+            pos += 1
+        elif _TBL[nxt] & _DIGIT:
+            kind, mask = TokenType.OCT, _OCTDIGIT
+        else:
+            kind, mask = TokenType.INT, 0
+        digits = pos
+        while pos < n and _TBL[buf[pos]] & mask:
+            pos += 1
+        if (kind is not TokenType.INT and pos == digits) or \
+                (pos < n and _TBL[buf[pos]] & _ALNUM):
+            while pos < n and _TBL[buf[pos]] & _ALNUM:
+                pos += 1
+            raise ValueError(f"Invalid number: {self.source[start:pos]}")
+        self.position = pos
+        return Token(self.source[start:pos], kind)
+
+    def _lex_dash(self, b):
+        if self.position < self.length and self.buf[self.position] == 0x2d:
+            start = self.position - 1
+            end = self.source.find("\n", self.position)
+            if end < 0:
+                end = self.length
+            self.position = end
+            return Token(self.source[start:end], TokenType.COM)
+        return _SUB_TOK
 
-        if self.position >= self.length:
-            return Token("", TokenType.EOF)
-         
-        current_char = self.source[self.position]
-        self.position += 1
-
-        if current_char.isdigit():
-            number_text = current_char
-            while(self.position < self.length and self.source[self.position].isalnum()):
-                number_text += self.source[self.position]
-                self.position += 1
-            if len(number_text) == 1:
-                return Token(number_text, TokenType.INT)
-            elif  number_text[1] == 'b' or number_text[1] == 'B':
-                return Token(number_text, TokenType.BIN)
-            elif number_text[1] == 'x' or number_text[1] == 'X':
-                return Token(number_text, TokenType.HEX)
-            elif number_text[0] == '0':
-                return Token(number_text, TokenType.OCT)
-            else:
-                return Token(number_text, TokenType.INT)
-        elif current_char == "\n":
-            return Token(current_char, TokenType.NLN)
-        elif current_char == " ":
-            return Token(current_char, TokenType.WSP)
-        elif current_char == "-":
-            if self.position < self.length and self.source[self.position] == '-':
-                comment_text = "--"
-                while (self.position < self.length and self.source[self.position] != "\n"):
-                    comment_text += self.source[self.position]
-                    self.position += 1
-                return Token(comment_text, TokenType.COM)
-            return Token(current_char, TokenType.SUB)
-        
-        elif current_char == "=":
-            return Token(current_char, TokenType.EQL)
-        elif current_char == "+":
-            return Token(current_char, TokenType.ADD)
-        elif current_char == "*":
-            return Token(current_char, TokenType.MUL)
-        elif current_char == "/":
-            return Token(current_char, TokenType.DIV)
-        elif current_char == "<" : 
-            if self.position < self.length and self.source[self.position] == '=':
-                self.position += 1
-                return Token("<=", TokenType.LEQ)
-            else:
-                return Token(current_char, TokenType.LTH)
-        elif current_char == "~":
-            return Token(current_char, TokenType.NEG)
-        elif current_char == 'n':
-            if self.source[self.position] == 'o' and self.source[self.position + 1] == 't':
-                self.position += 2 
-                return Token("not", TokenType.NOT)
-        elif current_char == "(":
-            if self.position < self.length and self.source[self.position] != "*":
-                return Token(current_char, TokenType.LPR)
-            else:
-                comment_text = "(*"
-                self.position +=1
-                while (self.source[self.position:self.position+2] != "*)"):
-                    comment_text += self.source[self.position]
-                    self.position += 1
-                comment_text += "*)"
-                self.position +=2
-                return Token(comment_text, TokenType.COM)
-        elif current_char == ")":
-            return Token(current_char, TokenType.RPR)
-        elif current_char == "t":
-            if self.source[self.position] == 'r' and self.source[self.position + 1] == 'u' and self.source[self.position + 2] == 'e':
-                self.position += 3
-                return Token('true', TokenType.TRU)
-        elif current_char == "f":
-            if self.source[self.position] == 'a' and self.source[self.position + 1] == 'l' and self.source[self.position + 2] == 's' and self.source[self.position + 3] == 'e':
-                self.position += 4
-                return Token('true', TokenType.FLS)
+    def _lex_less(self, b):
+        if self.position < self.length and self.buf[self.position] == 0x3d:
+            self.position += 1
+            return _LEQ_TOK
         else:
-            raise ValueError(f"Unexpected character: {current_char}")
\ No newline at end of file
+            return _LTH_TOK
+
+    def _lex_lparen(self, b):
+        if self.position >= self.length or self.buf[self.position] != 0x2a:
+            return _LPR_TOK
+        else:
+            start = self.position - 1
+            end = self.source.find("*)", self.position + 1)
+            if end < 0:
+                raise ValueError("Unterminated (* comment")
+            self.position = end + 2
+            return Token(self.source[start:self.position], TokenType.COM)
+
+    def _lex_n(self, b):
+        if self.buf.startswith(b'ot', self.position):
+            self.position += 2
+            return _NOT_TOK
+        return self._lex_default(b)
+
+    def _lex_t(self, b):
+        if self.buf.startswith(b'rue', self.position):
+            self.position += 3
+            return _TRU_TOK
+        return self._lex_default(b)
+
+    def _lex_f(self, b):
+        if self.buf.startswith(b'alse', self.position):
+            self.position += 4
+            return _FLS_TOK
+        return self._lex_default(b)
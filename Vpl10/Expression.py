@@ -1,9 +1,15 @@
-from abc import ABC, abstractmethod
 from Visitor import *
 
 
-class Expression(ABC):
-    @abstractmethod
+class Expression:
+    """
+    Every concrete expression has a class-level KIND, which is the position
+    of its typing function in Visitor._HANDLERS. The type checker uses it to
+    dispatch on a node without going through 'accept'.
+    """
+
+    __slots__ = ()
+
     def accept(self, visitor, arg):
         raise NotImplementedError
 
@@ -14,6 +20,9 @@ class Var(Expression):
     indentifier is the value associated with it in the environment table.
     """
 
+    __slots__ = ('identifier',)
+    KIND = 0
+
     def __init__(self, identifier):
         self.identifier = identifier
 
@@ -28,6 +37,9 @@ class Bln(Expression):
     the boolean itself.
     """
 
+    __slots__ = ('bln',)
+    KIND = 1
+
     def __init__(self, bln):
         self.bln = bln
 
@@ -41,6 +53,9 @@ class Num(Expression):
     an expression is the number itself.
     """
 
+    __slots__ = ('num',)
+    KIND = 2
+
     def __init__(self, num):
         self.num = num
 
@@ -54,14 +69,12 @@ class BinaryExpression(Expression):
     sub-expressions: the left operand and the right operand.
     """
 
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
         self.left = left
         self.right = right
 
-    @abstractmethod
-    def accept(self, visitor, arg):
-        raise NotImplementedError
-
 
 class Eql(BinaryExpression):
     """
@@ -70,6 +83,9 @@ class Eql(BinaryExpression):
     otherwise.
     """
 
+    __slots__ = ()
+    KIND = 3
+
     def accept(self, visitor, arg):
         return visitor.visit_eql(self, arg)
 
@@ -80,6 +96,9 @@ class Add(BinaryExpression):
     an expression is the addition of the two subexpression's values.
     """
 
+    __slots__ = ()
+    KIND = 6
+
     def accept(self, visitor, arg):
         return visitor.visit_add(self, arg)
 
@@ -91,6 +110,9 @@ class And(BinaryExpression):
     subexpression's values.
     """
 
+    __slots__ = ()
+    KIND = 4
+
     def accept(self, visitor, arg):
         return visitor.visit_and(self, arg)
 
@@ -102,6 +124,9 @@ class Or(BinaryExpression):
     subexpression's values.
     """
 
+    __slots__ = ()
+    KIND = 5
+
     def accept(self, visitor, arg):
         return visitor.visit_or(self, arg)
 
@@ -112,6 +137,9 @@ class Sub(BinaryExpression):
     an expression is the subtraction of the two subexpression's values.
     """
 
+    __slots__ = ()
+    KIND = 7
+
     def accept(self, visitor, arg):
         return visitor.visit_sub(self, arg)
 
@@ -122,6 +150,9 @@ class Mul(BinaryExpression):
     such an expression is the product of the two subexpression's values.
     """
 
+    __slots__ = ()
+    KIND = 8
+
     def accept(self, visitor, arg):
         return visitor.visit_mul(self, arg)
 
@@ -133,6 +164,9 @@ class Div(BinaryExpression):
     subexpression's values.
     """
 
+    __slots__ = ()
+    KIND = 9
+
     def accept(self, visitor, arg):
         return visitor.visit_div(self, arg)
 
@@ -145,6 +179,9 @@ class Leq(BinaryExpression):
     right operand. It is false otherwise.
     """
 
+    __slots__ = ()
+    KIND = 10
+
     def accept(self, visitor, arg):
         return visitor.visit_leq(self, arg)
 
@@ -157,6 +194,9 @@ class Lth(BinaryExpression):
     operand. It is false otherwise.
     """
 
+    __slots__ = ()
+    KIND = 11
+
     def accept(self, visitor, arg):
         return visitor.visit_lth(self, arg)
 
@@ -167,13 +207,11 @@ class UnaryExpression(Expression):
     sub-expression.
     """
 
+    __slots__ = ('exp',)
+
     def __init__(self, exp):
         self.exp = exp
 
-    @abstractmethod
-    def accept(self, visitor, arg):
-        raise NotImplementedError
-
 
 class Neg(UnaryExpression):
     """
@@ -181,6 +219,9 @@ class Neg(UnaryExpression):
     inverse of a number n is the number -n, so that the sum of both is zero.
     """
 
+    __slots__ = ()
+    KIND = 12
+
     def accept(self, visitor, arg):
         return visitor.visit_neg(self, arg)
 
@@ -191,6 +232,9 @@ class Not(UnaryExpression):
     boolean expression is the logical complement of that expression.
     """
 
+    __slots__ = ()
+    KIND = 13
+
     def accept(self, visitor, arg):
         return visitor.visit_not(self, arg)
 
@@ -200,6 +244,9 @@ class Let(Expression):
     This class represents a let expression.
     """
 
+    __slots__ = ('identifier', 'tp_var', 'exp_def', 'exp_body')
+    KIND = 14
+
     def __init__(self, identifier, tp_var, exp_def, exp_body):
         self.identifier = identifier
         self.tp_var = tp_var
@@ -215,6 +262,9 @@ class Fn(Expression):
     This class represents an anonymous function.
     """
 
+    __slots__ = ('formal', 'tp_var', 'body')
+    KIND = 16
+
     def __init__(self, formal, tp_var, body):
         self.formal = formal
         self.tp_var = tp_var
@@ -229,6 +279,9 @@ class App(Expression):
     This class represents a function application, such as 'e0 e1'.
     """
 
+    __slots__ = ('function', 'actual')
+    KIND = 17
+
     def __init__(self, function, actual):
         self.function = function
         self.actual = actual
@@ -242,6 +295,9 @@ class IfThenElse(Expression):
     This class represents a conditional expression.
     """
 
+    __slots__ = ('cond', 'e0', 'e1')
+    KIND = 15
+
     def __init__(self, cond, e0, e1):
         self.cond = cond
         self.e0 = e0
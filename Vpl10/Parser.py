@@ -34,13 +34,70 @@ References:
     see https://www.engr.mun.ca/~theo/Misc/exp_parsing.htm#classic
 """
 
+# Token kinds compared by the parser, bound once so that every predicate is
+# an identity test against a module constant. The hot rules also receive these
+# constants, and the node classes they build, as default arguments, so that
+# they are read as locals rather than looked up as globals.
+_ADD = TokenType.ADD
+_AND = TokenType.AND
+_ARW = TokenType.ARW
+_ASN = TokenType.ASN
+_COL = TokenType.COL
+_DIV = TokenType.DIV
+_ELS = TokenType.ELS
+_END = TokenType.END
+_EQL = TokenType.EQL
+_FLS = TokenType.FLS
+_FNX = TokenType.FNX
+_IFX = TokenType.IFX
+_INT = TokenType.INT
+_INX = TokenType.INX
+_LEQ = TokenType.LEQ
+_LET = TokenType.LET
+_LGC = TokenType.LGC
+_LPR = TokenType.LPR
+_LTH = TokenType.LTH
+_MUL = TokenType.MUL
+_NEG = TokenType.NEG
+_NOT = TokenType.NOT
+_NUM = TokenType.NUM
+_ORX = TokenType.ORX
+_RPR = TokenType.RPR
+_SUB = TokenType.SUB
+_THN = TokenType.THN
+_TPF = TokenType.TPF
+_TRU = TokenType.TRU
+_VAR = TokenType.VAR
+
+# The kinds of tokens that can start a 'val_tk', i.e., an argument of an
+# application in 'val_exp'.
+_VAL_TK_FIRST = frozenset({
+    _VAR, _LPR, _NUM, _TRU, _FLS
+})
+
+class ParseError(Exception):
+    """
+    Raised when the stream of tokens does not match the grammar. The message
+    describes the first token that could not be parsed. The parsing rules
+    raise it, and 'parse' turns it into a call to sys.exit with that message.
+    """
+
+
 class Parser:
+    __slots__ = ('kinds', 'texts', 'cur_token_idx')
+
     def __init__(self, tokens):
         """
         Initializes the parser. The parser keeps track of the list of tokens
         and the current token. For instance:
         """
-        self.tokens = list(tokens)
+        # The tokens are split into two parallel lists, one with the kinds and
+        # another with the texts, so that parsing rules read a kind with a
+        # single subscript. The EOF sentinel at the end means that the current
+        # kind is never out of range: rules can test it without a guard.
+        tokens = list(tokens)
+        self.kinds = [token.kind for token in tokens] + [TokenType.EOF]
+        self.texts = [token.text for token in tokens] + ['']
         self.cur_token_idx = 0 # This is just a suggestion!
         # You can (and probably should!) modify this method.
 
@@ -280,18 +337,12 @@ class Parser:
         >>> exp.accept(ev, {})
         <class 'int'>
         """
-        exp = self.expression()
+        try:
+            exp = self.expression()
+        except ParseError as e:
+            sys.exit(str(e))
         return exp
 
-    def current_token(self):
-        if self.cur_token_idx >= len(self.tokens):
-            return None
-        return self.tokens[self.cur_token_idx]
-
-    def eat(self):
-        if self.cur_token_idx < len(self.tokens):
-            self.cur_token_idx += 1
-
     def parse_type(self):
         """
         Parse type annotations: types ::= type -> types | type
@@ -299,9 +350,8 @@ class Parser:
         """
         left_type = self.parse_base_type()
         
-        token = self.current_token()
-        if token and token.kind.name == 'TPF':
-            self.eat()
+        if self.kinds[self.cur_token_idx] is _TPF:
+            self.cur_token_idx += 1
             right_type = self.parse_type()
             return ArrowType(left_type, right_type)
         
@@ -309,280 +359,238 @@ class Parser:
     
     def parse_base_type(self):
         """Parse: int | bool | ( types )"""
-        token = self.current_token()
-        
-        if not token:
-            sys.exit("Parse error: expected type")
-        
-        if token.kind.name == 'INT':
-            self.eat()
-            return type(1)
-        elif token.kind.name == 'LGC':
-            self.eat()
-            return type(True)
-        elif token.kind.name == 'LPR':
-            self.eat()
-            tp = self.parse_type()
-            if self.current_token() and self.current_token().kind.name == 'RPR':
-                self.eat()
-                return tp
-            else:
-                sys.exit("Parse error: expected ')' after type")
+        kind = self.kinds[self.cur_token_idx]
+        handler = _BASE_TYPE_TABLE.get(kind)
+        if handler is None:
+            raise ParseError(f"Parse error: expected type, got {kind.name}")
+        return handler(self)
+
+    def _tp_int(self):
+        self.cur_token_idx += 1
+        return type(1)
+
+    def _tp_lgc(self):
+        self.cur_token_idx += 1
+        return type(True)
+
+    def _tp_lpr(self):
+        self.cur_token_idx += 1
+        tp = self.parse_type()
+        if self.kinds[self.cur_token_idx] is _RPR:
+            self.cur_token_idx += 1
+            return tp
         else:
-            sys.exit(f"Parse error: expected type, got {token.kind.name}")
+            raise ParseError("Parse error: expected ')' after type")
 
     def fn_expr(self):
         """Parse: fn <var>: types => fn_exp | if_exp"""
-        token = self.current_token()
-        if token and token.kind.name == 'FNX':
-            self.eat()
-            param_token = self.current_token()
-            if not param_token or param_token.kind.name != 'VAR':
-                sys.exit("Parse error: expected variable after 'fn'")
-            param_name = param_token.text
-            self.eat()
-            colon_token = self.current_token()
-            if not colon_token or colon_token.kind.name != 'COL':
-                sys.exit("Parse error: expected ':' after parameter")
-            self.eat()
+        kinds = self.kinds
+        i = self.cur_token_idx
+        if kinds[i] is _FNX:
+            if kinds[i + 1] is not _VAR:
+                raise ParseError("Parse error: expected variable after 'fn'")
+            if kinds[i + 2] is not _COL:
+                raise ParseError("Parse error: expected ':' after parameter")
+            self.cur_token_idx = i + 3
             param_type = self.parse_type()
-            arrow_token = self.current_token()
-            if not arrow_token or arrow_token.kind.name != 'ARW':
-                sys.exit("Parse error: expected '=>' after type")
-            self.eat()
+            if kinds[self.cur_token_idx] is not _ARW:
+                raise ParseError("Parse error: expected '=>' after type")
+            self.cur_token_idx += 1
             body = self.fn_expr()
-            return Fn(param_name, param_type, body)
+            return Fn(self.texts[i + 1], param_type, body)
         return self.if_else_expr()
 
     def expression(self):
         return self.fn_expr()
 
-    def if_else_expr(self):
-        token = self.current_token()
-        if token and token.kind.name == 'IFX':
-            self.eat()
+    def if_else_expr(self, _IFX=_IFX, _THN=_THN, _ELS=_ELS, IfThenElse=IfThenElse):
+        kinds = self.kinds
+        if kinds[self.cur_token_idx] is _IFX:
+            self.cur_token_idx += 1
             cond = self.if_else_expr()
-            if self.current_token() and self.current_token().kind.name == 'THN':
-                self.eat()
+            if kinds[self.cur_token_idx] is _THN:
+                self.cur_token_idx += 1
                 then = self.fn_expr()
-                if self.current_token() and self.current_token().kind.name == 'ELS':
-                    self.eat()
+                if kinds[self.cur_token_idx] is _ELS:
+                    self.cur_token_idx += 1
                     els = self.fn_expr()
                     return IfThenElse(cond, then, els)
         return self.or_expr()
          
-    def or_expr(self):
+    def or_expr(self, _ORX=_ORX, Or=Or):
         left = self.and_expr()
-        return self.or_rest(left)
-    
-    def or_rest(self,left):
-        token = self.current_token()
+        kinds = self.kinds
+        while True:
+            kind = kinds[self.cur_token_idx]
+            if kind is _ORX:
+                self.cur_token_idx += 1
+                left = Or(left, self.and_expr())
+            else:
+                return left
 
-        if token and token.kind.name == 'ORX':
-            self.eat()
-            right = self.and_expr()
-            return self.or_rest(Or(left, right))
-        return left
-    
-    def and_expr(self):
+    def and_expr(self, _AND=_AND, And=And):
         left = self.comparison_expr()
-        return self.and_rest(left)
-
-    def and_rest(self,left):
-        token = self.current_token()
-
-        if token and token.kind.name == 'AND':
-            self.eat()
-            right = self.comparison_expr()
-            return self.and_rest(And(left, right))
-        return left        
+        kinds = self.kinds
+        while True:
+            kind = kinds[self.cur_token_idx]
+            if kind is _AND:
+                self.cur_token_idx += 1
+                left = And(left, self.comparison_expr())
+            else:
+                return left
 
-    def comparison_expr(self):  
+    def comparison_expr(self, _EQL=_EQL, Eql=Eql):
         left = self.less_expr()
-        return self.comparison_rest(left)
-
-    def comparison_rest(self, left):
-        token = self.current_token()
-        
-        if token and token.kind.name == 'EQL':
-            self.eat()
-            right = self.less_expr()
-            return self.comparison_rest(Eql(left, right))
-        return left
+        kinds = self.kinds
+        while True:
+            kind = kinds[self.cur_token_idx]
+            if kind is _EQL:
+                self.cur_token_idx += 1
+                left = Eql(left, self.less_expr())
+            else:
+                return left
 
-    def less_expr(self):
+    def less_expr(self, _LEQ=_LEQ, _LTH=_LTH, Leq=Leq, Lth=Lth):
         left = self.additive_expr()
-        return self.less_rest(left)
-    
-    def less_rest(self, left):
-        token = self.current_token()
-        
-        if token and token.kind.name == 'LEQ':
-            self.eat()
-            right = self.additive_expr()
-            return self.less_rest(Leq(left, right))
-        elif token and token.kind.name == 'LTH':
-            self.eat()
-            right = self.additive_expr()
-            return self.less_rest(Lth(left, right))
-        return left
+        kinds = self.kinds
+        while True:
+            kind = kinds[self.cur_token_idx]
+            if kind is _LEQ:
+                self.cur_token_idx += 1
+                left = Leq(left, self.additive_expr())
+            elif kind is _LTH:
+                self.cur_token_idx += 1
+                left = Lth(left, self.additive_expr())
+            else:
+                return left
 
-    def additive_expr(self):
+    def additive_expr(self, _ADD=_ADD, _SUB=_SUB, Add=Add, Sub=Sub):
         left = self.multiplicative_expr()
-        return self.additive_rest(left)
-
-    def additive_rest(self, left):
-        token = self.current_token()
-        
-        if token and token.kind.name == 'ADD':
-            self.eat()
-            right = self.multiplicative_expr()
-            return self.additive_rest(Add(left, right))
-        elif token and token.kind.name == 'SUB':
-            self.eat()
-            right = self.multiplicative_expr()
-            return self.additive_rest(Sub(left, right))
-        
-        return left
+        kinds = self.kinds
+        while True:
+            kind = kinds[self.cur_token_idx]
+            if kind is _ADD:
+                self.cur_token_idx += 1
+                left = Add(left, self.multiplicative_expr())
+            elif kind is _SUB:
+                self.cur_token_idx += 1
+                left = Sub(left, self.multiplicative_expr())
+            else:
+                return left
 
-    def multiplicative_expr(self):
+    def multiplicative_expr(self, _MUL=_MUL, _DIV=_DIV, Mul=Mul, Div=Div):
         left = self.unary_expr()
-        return self.multiplicative_rest(left)
-
-    def multiplicative_rest(self, left):
-        token = self.current_token()
-        
-        if token and token.kind.name == 'MUL':
-            self.eat()
-            right = self.unary_expr()
-            return self.multiplicative_rest(Mul(left, right))
-        elif token and token.kind.name == 'DIV':
-            self.eat()
-            right = self.unary_expr()
-            return self.multiplicative_rest(Div(left, right))
-        return left
+        kinds = self.kinds
+        while True:
+            kind = kinds[self.cur_token_idx]
+            if kind is _MUL:
+                self.cur_token_idx += 1
+                left = Mul(left, self.unary_expr())
+            elif kind is _DIV:
+                self.cur_token_idx += 1
+                left = Div(left, self.unary_expr())
+            else:
+                return left
 
-    def unary_expr(self):
-        token = self.current_token()
-        if token and token.kind.name == 'NEG':
-            self.eat()
+    def unary_expr(self, _NEG=_NEG, _NOT=_NOT, Neg=Neg, Not=Not):
+        kind = self.kinds[self.cur_token_idx]
+        if kind is _NEG:
+            self.cur_token_idx += 1
             exp = self.unary_expr()
             return Neg(exp)
-        elif token and token.kind.name == 'NOT':
-            self.eat()
+        elif kind is _NOT:
+            self.cur_token_idx += 1
             exp = self.unary_expr()
             return Not(exp)
         return self.let_expr()
 
     def let_expr(self):
-        token = self.current_token()
-        if token and token.kind.name == 'LET':
-            self.eat()
-            
-            var_token = self.current_token()
-            if not var_token or var_token.kind.name != 'VAR':
-                sys.exit("Parse error: expected variable after 'let'")
-            var_name = var_token.text
-            self.eat()
-            
-            colon_token = self.current_token()
-            if not colon_token or colon_token.kind.name != 'COL':
-                sys.exit("Parse error: expected ':' after variable")
-            self.eat()
-            
+        kinds = self.kinds
+        i = self.cur_token_idx
+        if kinds[i] is _LET:
+            # The EOF sentinel is never matched, so each lookahead below stays
+            # inside the list once the previous token has been validated.
+            if kinds[i + 1] is not _VAR:
+                raise ParseError("Parse error: expected variable after 'let'")
+            if kinds[i + 2] is not _COL:
+                raise ParseError("Parse error: expected ':' after variable")
+            self.cur_token_idx = i + 3
+
             var_type = self.parse_type()
-            
-            asn_token = self.current_token()
-            if not asn_token or asn_token.kind.name != 'ASN':
-                sys.exit("Parse error: expected '<-' after type")
-            self.eat()
-            
+
+            if kinds[self.cur_token_idx] is not _ASN:
+                raise ParseError("Parse error: expected '<-' after type")
+            self.cur_token_idx += 1
+
             value_expr = self.fn_expr()
-            
-            in_token = self.current_token()
-            if not in_token or in_token.kind.name != 'INX':
-                sys.exit("Parse error: expected 'in'")
-            self.eat()
-            
+
+            if kinds[self.cur_token_idx] is not _INX:
+                raise ParseError("Parse error: expected 'in'")
+            self.cur_token_idx += 1
+
             body_expr = self.fn_expr()
-            
-            end_token = self.current_token()
-            if not end_token or end_token.kind.name != 'END':
-                sys.exit("Parse error: expected 'end'")
-            self.eat()
-            
-            return Let(var_name, var_type, value_expr, body_expr)
-        
+
+            if kinds[self.cur_token_idx] is not _END:
+                raise ParseError("Parse error: expected 'end'")
+            self.cur_token_idx += 1
+
+            return Let(self.texts[i + 1], var_type, value_expr, body_expr)
+
         return self.val_expr()
 
-    def val_expr(self):
+    def val_expr(self, _VAL_TK_FIRST=_VAL_TK_FIRST, App=App):
         left = self.val_tk()
-        
-        while True:
-            token = self.current_token()
-            if token and (token.kind.name == 'VAR' or 
-                         token.kind.name == 'LPR' or 
-                         token.kind.name == 'NUM' or 
-                         token.kind.name == 'TRU' or 
-                         token.kind.name == 'FLS'):
-                right = self.val_tk()
-                left = App(left, right)
-            else:
-                break
-        
+        kinds = self.kinds
+        while kinds[self.cur_token_idx] in _VAL_TK_FIRST:
+            left = App(left, self.val_tk())
         return left
 
     def val_tk(self):
-        token = self.current_token()
-        
-        if not token:
-            sys.exit("Parse error")
-        
-        if token.kind.name == 'LPR':
-            self.eat()
-            exp = self.fn_expr()
-            if self.current_token() and self.current_token().kind.name == 'RPR':
-                self.eat()
-                return exp
-            else:
-                sys.exit("Parse error")
-        elif token.kind.name == 'NUM':
-            self.eat()
-            return Num(int(token.text))
-        elif token.kind.name == 'TRU':
-            self.eat()
-            return Bln(True)
-        elif token.kind.name == 'FLS':
-            self.eat()
-            return Bln(False)
-        elif token.kind.name == 'VAR':
-            self.eat()
-            return Var(token.text)
-        else:
-            sys.exit(f"Parse error")
-
-    def primary(self):
-        token = self.current_token()
-        
-        if token.kind.name == 'LPR':
-            self.eat()
-            exp = self.expression()
-            if self.current_token() and self.current_token().kind.name == 'RPR':
-                self.eat()
-                return exp
-        elif token and token.kind.name == 'IFX':
-            return self.if_else_expr()
-        elif token.kind.name == 'NUM':
-            self.eat()
-            return Num(int(token.text))
-        elif token.kind.name == 'TRU':
-            self.eat()
-            return Bln(True)
-        elif token.kind.name == 'FLS':
-            self.eat()
-            return Bln(False)
-        elif token.kind.name == 'VAR':
-            self.eat()
-            return Var(token.text)
+        handler = _VAL_TK_TABLE.get(self.kinds[self.cur_token_idx])
+        if handler is None:
+            raise ParseError("Parse error")
+        return handler(self)
+
+    def _tk_lpr(self):
+        self.cur_token_idx += 1
+        exp = self.fn_expr()
+        if self.kinds[self.cur_token_idx] is _RPR:
+            self.cur_token_idx += 1
+            return exp
         else:
-            sys.exit("Parse error")
\ No newline at end of file
+            raise ParseError("Parse error")
+
+    def _tk_num(self):
+        i = self.cur_token_idx
+        self.cur_token_idx = i + 1
+        return Num(int(self.texts[i]))
+
+    def _tk_tru(self):
+        self.cur_token_idx += 1
+        return Bln(True)
+
+    def _tk_fls(self):
+        self.cur_token_idx += 1
+        return Bln(False)
+
+    def _tk_var(self):
+        i = self.cur_token_idx
+        self.cur_token_idx = i + 1
+        return Var(self.texts[i])
+
+
+# Handlers of the alternatives of 'type' and 'val_tk', keyed by the kind of
+# the token that starts each alternative.
+_BASE_TYPE_TABLE = {
+    _INT: Parser._tp_int,
+    _LGC: Parser._tp_lgc,
+    _LPR: Parser._tp_lpr,
+}
+
+_VAL_TK_TABLE = {
+    _LPR: Parser._tk_lpr,
+    _NUM: Parser._tk_num,
+    _TRU: Parser._tk_tru,
+    _FLS: Parser._tk_fls,
+    _VAR: Parser._tk_var,
+}
@@ -1,9 +1,9 @@
 import sys
-from abc import ABC, abstractmethod
+import weakref
 from Expression import *
 
 
-class Visitor(ABC):
+class Visitor:
     """
     The visitor pattern consists of two abstract classes: the Expression and the
     Visitor. The Expression class defines on method: 'accept(visitor, args)'.
@@ -13,77 +13,59 @@ class Visitor(ABC):
     subclasse will invoke the right visiting method.
     """
 
-    @abstractmethod
     def visit_var(self, exp, arg):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_bln(self, exp, arg):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_num(self, exp, arg):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_eql(self, exp, arg):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_and(self, exp, arg):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_or(self, exp, arg):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_add(self, exp, arg):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_sub(self, exp, arg):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_mul(self, exp, arg):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_div(self, exp, arg):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_leq(self, exp, arg):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_lth(self, exp, arg):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_neg(self, exp, arg):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_not(self, exp, arg):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_let(self, exp, arg):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_ifThenElse(self, exp, arg):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_fn(self, exp, arg):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_app(self, exp, arg):
-        pass
+        raise NotImplementedError
 
 
 class ArrowType:
@@ -101,25 +83,35 @@ class ArrowType:
         >>> t = ArrowType(type(1), type(True))
         >>> str(t)
         "<class 'int'> -> <class 'bool'>"
+
+    Arrow types are interned: building the same head and tail twice gives
+    back the same object, so two arrow types are equal if, and only if, they
+    are the same object, and comparing them does not walk their structure.
+        >>> t0 = ArrowType(type(1), ArrowType(type(1), type(1)))
+        >>> t1 = ArrowType(type(1), ArrowType(type(1), type(1)))
+        >>> t0 == t1, t0 is t1
+        (True, True)
+        >>> t0 == ArrowType(type(1), type(1))
+        False
     """
 
-    def __init__(self, tp_formal, tp_body):
-        self.hd = tp_formal
-        self.tl = tp_body
+    __slots__ = ('hd', 'tl', '__weakref__')
 
-    def __eq__(self, other):
-        """
-        Two arrow types are equal if their head and tail are equal.
-        Example:
-            >>> t0 = ArrowType(type(1), ArrowType(type(1), type(1)))
-            >>> t1 = ArrowType(type(1), ArrowType(type(1), type(1)))
-            >>> t0 == t1
-            True
-        """
-        if isinstance(other, ArrowType):
-            return self.hd == other.hd and self.tl == other.tl
-        else:
-            return False
+    # Every arrow type still in use, keyed by its (head, tail) pair. Heads and
+    # tails are base types or interned arrow types, which hash by identity.
+    # The values are weak, so an arrow type leaves the table once nothing else
+    # refers to it; while it lives, it is the only one with its head and tail.
+    _INTERN = weakref.WeakValueDictionary()
+
+    def __new__(cls, tp_formal, tp_body):
+        key = (tp_formal, tp_body)
+        tp = cls._INTERN.get(key)
+        if tp is None:
+            tp = object.__new__(cls)
+            tp.hd = tp_formal
+            tp.tl = tp_body
+            cls._INTERN[key] = tp
+        return tp
 
     def __repr__(self):
         if isinstance(self.hd, ArrowType):
@@ -133,14 +125,227 @@ class ArrowType:
         return f"{hd_str} -> {tl_str}"
 
 
+class VplTypeError(Exception):
+    """
+    Raised when a program is not well typed ("Type error"), or when it uses a
+    variable that is not defined ("Def error"). The typing functions raise it
+    so that the Let and Fn bindings unwind on the way out. 'type_check' and
+    'TypeCheckVisitor.check' let it propagate to their callers, while the
+    visit methods, reached through 'accept', turn it into a call to sys.exit
+    with its message.
+    """
+
+
+# The two base types. Arrow types are interned, so every type is either one
+# of these classes or a unique ArrowType, and types are compared by identity.
+_INT = int
+_BOOL = bool
+
+# Let and Fn bind their variable in the environment they receive, and undo
+# the binding on the way out, instead of copying the whole environment. This
+# marks a name that was not bound before.
+_UNBOUND = object()
+
+
+def type_check(exp, env):
+    """
+    Returns the type of 'exp' in the environment 'env'. This is the same as
+    'exp.accept(TypeCheckVisitor(), env)', but the checker below dispatches
+    straight on the kind of each node, without visitor objects.
+
+    Usage:
+        >>> type_check(Add(Num(1), Num(2)), {})
+        <class 'int'>
+
+    A program that is not well typed raises VplTypeError:
+        >>> type_check(Add(Num(1), Bln(True)), {})
+        Traceback (most recent call last):
+        ...
+        Visitor.VplTypeError: Type error
+    """
+    return _HANDLERS[exp.KIND](exp, env)
+
+
+def _checked(tc, exp, env):
+    try:
+        return tc(exp, env)
+    except VplTypeError as e:
+        sys.exit(str(e))
+
+
+def _tc_var(exp, env):
+    if exp.identifier in env:
+        return env[exp.identifier]
+    else:
+        raise VplTypeError("Def error")
+
+
+def _tc_bln(exp, env):
+    return type(exp.bln)
+
+
+def _tc_num(exp, env):
+    return type(exp.num)
+
+
+def _tc_eql(exp, env):
+    left, right = exp.left, exp.right
+    if _HANDLERS[left.KIND](left, env) is _HANDLERS[right.KIND](right, env):
+        return _BOOL
+    else:
+        raise VplTypeError("Type error")
+
+
+def _binop_rule(operand, result):
+    """
+    Returns the typing function of the binary operators whose two operands
+    must have type 'operand', and whose result has type 'result'.
+    """
+    def check(exp, env):
+        left, right = exp.left, exp.right
+        if _HANDLERS[left.KIND](left, env) is operand and _HANDLERS[right.KIND](right, env) is operand:
+            return result
+        else:
+            raise VplTypeError("Type error")
+    return check
+
+
+_tc_bool_binop = _binop_rule(_BOOL, _BOOL)  # And, Or
+_tc_int_binop = _binop_rule(_INT, _INT)     # Add, Sub, Mul, Div
+_tc_cmp_binop = _binop_rule(_INT, _BOOL)    # Leq, Lth
+
+
+def _tc_neg(exp, env):
+    if _HANDLERS[exp.exp.KIND](exp.exp, env) is _INT:
+        return _INT
+    else:
+        raise VplTypeError("Type error")
+
+
+def _tc_not(exp, env):
+    if _HANDLERS[exp.exp.KIND](exp.exp, env) is _BOOL:
+        return _BOOL
+    else:
+        raise VplTypeError("Type error")
+
+
+def _tc_ifThenElse(exp, env):
+    cond_type = _HANDLERS[exp.cond.KIND](exp.cond, env)
+    if cond_type is not _BOOL:
+        raise VplTypeError("Type error")
+
+    type_e0 = _HANDLERS[exp.e0.KIND](exp.e0, env)
+    type_e1 = _HANDLERS[exp.e1.KIND](exp.e1, env)
+
+    if isinstance(type_e0, ArrowType) and isinstance(type_e1, ArrowType):
+        if type_e0.hd is type_e1.hd:
+            return type_e0
+        else:
+            raise VplTypeError("Type error")
+    elif type_e0 is type_e1:
+        return type_e0
+    else:
+        raise VplTypeError("Type error")
+
+
+def _tc_let(exp, env):
+    type_def = _HANDLERS[exp.exp_def.KIND](exp.exp_def, env)
+
+    if type_def is not exp.tp_var:
+        raise VplTypeError("Type error")
+
+    if env is None:
+        env = {}
+    name = exp.identifier
+    shadowed = env.get(name, _UNBOUND)
+    env[name] = exp.tp_var
+    try:
+        return _HANDLERS[exp.exp_body.KIND](exp.exp_body, env)
+    finally:
+        if shadowed is _UNBOUND:
+            del env[name]
+        else:
+            env[name] = shadowed
+
+
+def _tc_fn(exp, env):
+    if env is None:
+        env = {}
+    name = exp.formal
+    shadowed = env.get(name, _UNBOUND)
+    env[name] = exp.tp_var
+    try:
+        type_body = _HANDLERS[exp.body.KIND](exp.body, env)
+    finally:
+        if shadowed is _UNBOUND:
+            del env[name]
+        else:
+            env[name] = shadowed
+
+    return ArrowType(exp.tp_var, type_body)
+
+
+def _tc_app(exp, env):
+    type_function = _HANDLERS[exp.function.KIND](exp.function, env)
+
+    if not isinstance(type_function, ArrowType):
+        raise VplTypeError("Type error")
+
+    type_actual = _HANDLERS[exp.actual.KIND](exp.actual, env)
+
+    if type_actual is not type_function.hd:
+        raise VplTypeError("Type error")
+
+    return type_function.tl
+
+
+# The type-checking function of each kind of expression, indexed by
+# Expression.KIND. Binary operators with the same typing rule share one.
+_HANDLERS = [
+    _tc_var,
+    _tc_bln,
+    _tc_num,
+    _tc_eql,
+    _tc_bool_binop,  # And
+    _tc_bool_binop,  # Or
+    _tc_int_binop,   # Add
+    _tc_int_binop,   # Sub
+    _tc_int_binop,   # Mul
+    _tc_int_binop,   # Div
+    _tc_cmp_binop,   # Leq
+    _tc_cmp_binop,   # Lth
+    _tc_neg,
+    _tc_not,
+    _tc_let,
+    _tc_ifThenElse,
+    _tc_fn,
+    _tc_app,
+]
+
+
 class TypeCheckVisitor(Visitor):
     """
     The TypeCheckVisitor class evaluates logical and arithmetic expressions. The
     result of evaluating an expression is the value of that expression. The
     inherited attribute propagated throughout visits is the environment that
-    associates the names of variables with values.
+    associates the names of variables with values. Each visiting method checks
+    its node with the corresponding function of 'type_check', which descends
+    into the children without going back through 'accept'.
     """
 
+    def check(self, exp, env):
+        """
+        Returns the type of 'exp' in 'env', entering the checker through the
+        table of typing functions rather than through 'exp.accept'. Raises
+        VplTypeError if 'exp' is not well typed.
+
+        Usage:
+            >>> ev = TypeCheckVisitor()
+            >>> ev.check(Lth(Num(1), Num(0)), {})
+            <class 'bool'>
+        """
+        return _HANDLERS[exp.KIND](exp, env)
+
     def visit_var(self, exp, env):
         """
         Usage:
@@ -154,10 +359,7 @@ class TypeCheckVisitor(Visitor):
             >>> e.accept(ev, {'t':ArrowType(type(1), type(True))})
             <class 'int'> -> <class 'bool'>
         """
-        if exp.identifier in env:
-            return env[exp.identifier]
-        else:
-            sys.exit("Def error")
+        return _checked(_tc_var, exp, env)
 
     def visit_bln(self, exp, env):
         """
@@ -167,7 +369,7 @@ class TypeCheckVisitor(Visitor):
             >>> e.accept(ev, None)
             <class 'bool'>
         """
-        return type(exp.bln)
+        return _checked(_tc_bln, exp, env)
 
     def visit_num(self, exp, env):
         """
@@ -177,7 +379,7 @@ class TypeCheckVisitor(Visitor):
             >>> e.accept(ev, None)
             <class 'int'>
         """
-        return type(exp.num)
+        return _checked(_tc_num, exp, env)
 
     def visit_eql(self, exp, env): # Implemented for you :) Thanks
         """
@@ -187,10 +389,7 @@ class TypeCheckVisitor(Visitor):
             >>> e.accept(ev, None)
             <class 'bool'>
         """
-        if exp.left.accept(self, env) == exp.right.accept(self, env):
-            return type(True)
-        else:
-            sys.exit("Type error")
+        return _checked(_tc_eql, exp, env)
 
     def visit_and(self, exp, env):
         """
@@ -200,10 +399,7 @@ class TypeCheckVisitor(Visitor):
             >>> e.accept(ev, None)
             <class 'bool'>
         """
-        if exp.left.accept(self, env) == type(True) and exp.right.accept(self, env) == type(True):
-            return type(True)
-        else:
-            sys.exit("Type error")
+        return _checked(_tc_bool_binop, exp, env)
 
     def visit_or(self, exp, env):
         """
@@ -213,10 +409,7 @@ class TypeCheckVisitor(Visitor):
             >>> e.accept(ev, None)
             <class 'bool'>
         """
-        if exp.left.accept(self, env) == type(True) and exp.right.accept(self, env) == type(True):
-            return type(True)
-        else:
-            sys.exit("Type error")
+        return _checked(_tc_bool_binop, exp, env)
 
     def visit_add(self, exp, env):
         """
@@ -226,10 +419,7 @@ class TypeCheckVisitor(Visitor):
             >>> e.accept(ev, None)
             <class 'int'>
         """
-        if exp.left.accept(self, env) == type(1) and exp.right.accept(self, env) == type(1):
-            return type(1)
-        else:
-            sys.exit("Type error")
+        return _checked(_tc_int_binop, exp, env)
 
     def visit_sub(self, exp, env):
         """
@@ -239,10 +429,7 @@ class TypeCheckVisitor(Visitor):
             >>> e.accept(ev, None)
             <class 'int'>
         """
-        if exp.left.accept(self, env) == type(1) and exp.right.accept(self, env) == type(1):
-            return type(1)
-        else:
-            sys.exit("Type error")
+        return _checked(_tc_int_binop, exp, env)
 
     def visit_mul(self, exp, env):
         """
@@ -252,10 +439,7 @@ class TypeCheckVisitor(Visitor):
             >>> e.accept(ev, None)
             <class 'int'>
         """
-        if exp.left.accept(self, env) == type(1) and exp.right.accept(self, env) == type(1):
-            return type(1)
-        else:
-            sys.exit("Type error")
+        return _checked(_tc_int_binop, exp, env)
 
     def visit_div(self, exp, env):
         """
@@ -265,10 +449,7 @@ class TypeCheckVisitor(Visitor):
             >>> e.accept(ev, None)
             <class 'int'>
         """
-        if exp.left.accept(self, env) == type(1) and exp.right.accept(self, env) == type(1):
-            return type(1)
-        else:
-            sys.exit("Type error")
+        return _checked(_tc_int_binop, exp, env)
 
     def visit_leq(self, exp, env):
         """
@@ -278,10 +459,7 @@ class TypeCheckVisitor(Visitor):
             >>> e.accept(ev, None)
             <class 'bool'>
         """
-        if exp.left.accept(self, env) == type(1) and exp.right.accept(self, env) == type(1):
-            return type(True)
-        else:
-            sys.exit("Type error")
+        return _checked(_tc_cmp_binop, exp, env)
 
     def visit_lth(self, exp, env):
         """
@@ -291,10 +469,7 @@ class TypeCheckVisitor(Visitor):
             >>> e.accept(ev, None)
             <class 'bool'>
         """
-        if exp.left.accept(self, env) == type(1) and exp.right.accept(self, env) == type(1):
-            return type(True)
-        else:
-            sys.exit("Type error")
+        return _checked(_tc_cmp_binop, exp, env)
 
     def visit_neg(self, exp, env):
         """
@@ -304,10 +479,7 @@ class TypeCheckVisitor(Visitor):
             >>> e.accept(ev, None)
             <class 'int'>
         """
-        if exp.exp.accept(self, env) == type(1):
-            return type(1)
-        else:
-            sys.exit("Type error")
+        return _checked(_tc_neg, exp, env)
 
     def visit_not(self, exp, env):
         """
@@ -317,10 +489,7 @@ class TypeCheckVisitor(Visitor):
             >>> e.accept(ev, None)
             <class 'bool'>
         """
-        if exp.exp.accept(self, env) == type(True):
-            return type(True)
-        else:
-            sys.exit("Type error")
+        return _checked(_tc_not, exp, env)
 
     def visit_ifThenElse(self, exp, env):
         """
@@ -339,22 +508,7 @@ class TypeCheckVisitor(Visitor):
             >>> e.accept(ev, {'v':tp0, 'w':tp1})
             <class 'int'> -> <class 'int'>
         """
-        cond_type = exp.cond.accept(self, env)
-        if cond_type != type(True):
-            sys.exit("Type error")
-        
-        type_e0 = exp.e0.accept(self, env)
-        type_e1 = exp.e1.accept(self, env)
-        
-        if isinstance(type_e0, ArrowType) and isinstance(type_e1, ArrowType):
-            if type_e0.hd == type_e1.hd:
-                return ArrowType(type_e0.hd, type_e0.tl)
-            else:
-                sys.exit("Type error")
-        elif type_e0 == type_e1:
-            return type_e0
-        else:
-            sys.exit("Type error")
+        return _checked(_tc_ifThenElse, exp, env)
 
     def visit_let(self, exp, env):
         """
@@ -369,15 +523,7 @@ class TypeCheckVisitor(Visitor):
             >>> e.accept(ev, {})
             <class 'int'>
         """
-        type_def = exp.exp_def.accept(self, env)
-        
-        if type_def != exp.tp_var:
-            sys.exit("Type error")
-        
-        new_env = env.copy() if env else {}
-        new_env[exp.identifier] = exp.tp_var
-        
-        return exp.exp_body.accept(self, new_env)
+        return _checked(_tc_let, exp, env)
 
     def visit_fn(self, exp, env):
         """
@@ -398,12 +544,7 @@ class TypeCheckVisitor(Visitor):
             >>> e1.accept(ev, {})
             <class 'int'> -> ( <class 'int'> -> <class 'int'> )
         """
-        new_env = env.copy() if env else {}
-        new_env[exp.formal] = exp.tp_var
-        
-        type_body = exp.body.accept(self, new_env)
-        
-        return ArrowType(exp.tp_var, type_body)
+        return _checked(_tc_fn, exp, env)
 
     def visit_app(self, exp, env):
         """
@@ -421,14 +562,4 @@ class TypeCheckVisitor(Visitor):
             >>> e2.accept(ev, {})
             <class 'int'> -> <class 'int'>
         """
-        type_function = exp.function.accept(self, env)
-        
-        if not isinstance(type_function, ArrowType):
-            sys.exit("Type error")
-        
-        type_actual = exp.actual.accept(self, env)
-        
-        if type_actual != type_function.hd:
-            sys.exit("Type error")
-        
-        return type_function.tl
\ No newline at end of file
+        return _checked(_tc_app, exp, env)
@@ -13,6 +13,11 @@ values. The following instructions are recognized:
     * div rd, rs1, rs2: rd = rs1 // rs2 (signed integer division)
     * slt rd, rs1, rs2: rd = (rs1 < rs2) ? 1 : 0 (signed comparison)
     * slti rd, rs1, imm: rd = (rs1 < imm) ? 1 : 0
+    * slli rd, rs1, imm: rd = rs1 << imm
+    * srai rd, rs1, imm: rd = rs1 >> imm (arithmetic shift)
+    * li rd, imm: rd = imm
+
+The last three instructions are produced by 'Program.optimize'.
 
 This file uses doctests all over. To test it, just run python 3 as follows:
 "python3 -m doctest Asm.py". The program uses syntax that is excluive of
@@ -20,9 +25,76 @@ Python 3. It will not work with standard Python 2.
 """
 
 import sys
+import operator
 from collections import deque
+from itertools import islice
 from abc import ABC, abstractmethod
 
+# The opcodes of the instructions, used in their encoded form (see
+# 'Inst.encode'). OP_INST stands for any other instruction, which the
+# interpreter evaluates through its 'eval' method.
+OP_INST = -1
+OP_ADD = 0
+OP_ADDI = 1
+OP_MUL = 2
+OP_SUB = 3
+OP_XOR = 4
+OP_XORI = 5
+OP_DIV = 6
+OP_SLT = 7
+OP_SLTI = 8
+OP_SLLI = 9
+OP_SRAI = 10
+OP_LI = 11
+
+# How 'Program.optimize' computes the result of an instruction whose operands
+# are known, for instructions with two names and with a name and an immediate.
+_FOLD = {
+    OP_ADD: operator.add,
+    OP_SUB: operator.sub,
+    OP_MUL: operator.mul,
+    OP_XOR: operator.xor,
+    OP_DIV: operator.floordiv,
+    OP_SLT: lambda a, b: 1 if a < b else 0,
+}
+
+_FOLD_IMM = {
+    OP_ADDI: operator.add,
+    OP_XORI: operator.xor,
+    OP_SLTI: lambda a, b: 1 if a < b else 0,
+    OP_SLLI: operator.lshift,
+    OP_SRAI: operator.rshift,
+}
+
+
+def _log2(n):
+    """
+    Returns k if n is 2 ** k, and None otherwise (including n is None).
+
+    >>> _log2(8), _log2(1), _log2(6), _log2(-4), _log2(None)
+    (3, 0, None, None, None)
+    """
+    if n is not None and n > 0 and n & (n - 1) == 0:
+        return n.bit_length() - 1
+    return None
+
+
+class _Names(dict):
+    """
+    Maps names to their indices in the list 'vals'. Looking up a name that is
+    not there yet gives it the next index, which holds no value (None).
+    """
+
+    __slots__ = ('vals',)
+
+    def __init__(self):
+        self.vals = []
+
+    def __missing__(self, name):
+        idx = self[name] = len(self.vals)
+        self.vals.append(None)
+        return idx
+
 
 class Program:
     """
@@ -33,10 +105,17 @@ class Program:
     """
 
     def __init__(self, env, insts):
-        self.__env = env
+        # Every name gets a small integer index the first time it is seen, and
+        # its value is kept at that position of '__vals'.
+        self.__names = _Names()
+        self.__vals = self.__names.vals
+        for name, value in env.items():
+            self.set_val(name, value)
+        self.set_val("x0", 0)
         self.__insts = insts
+        # The encoded form of each instruction, which is what 'eval' runs.
+        self.__code = [inst.encode(self.__names) for inst in insts]
         self.pc = 0
-        self.__env["x0"] = 0
 
     def get_inst(self):
         if self.pc >= 0 and self.pc < len(self.__insts):
@@ -48,12 +127,13 @@ class Program:
 
     def add_inst(self, inst):
         self.__insts.append(inst)
+        self.__code.append(inst.encode(self.__names))
 
     def set_pc(self, pc):
         self.pc = pc
 
     def set_val(self, name, value):
-        self.__env[name] = value
+        self.__vals[self.__names[name]] = value
 
     def get_val(self, name):
         """
@@ -63,19 +143,79 @@ class Program:
         >>> p.get_val("x0")
         0
         """
-        if name in self.__env:
-            return self.__env[name]
+        idx = self.__names.get(name)
+        if idx is not None and self.__vals[idx] is not None:
+            return self.__vals[idx]
         else:
             sys.exit("Def error")
 
     def print_env(self):
-        for name, val in sorted(self.__env.items()):
-            print(f"{name}: {val}")
+        vals = self.__vals
+        for name, idx in sorted(self.__names.items()):
+            if vals[idx] is not None:
+                print(f"{name}: {vals[idx]}")
 
     def print_insts(self):
         for inst in self.__insts:
             print(inst)
 
+    def optimize(self):
+        """
+        Rewrites the instructions into cheaper ones that give every name the
+        same value. Names whose values are known from the instructions before
+        them are propagated: an instruction that only uses known values
+        becomes a 'li', and multiplication or division by a known power of two
+        becomes a shift. The only value assumed before the first instruction
+        is x0, which is zero. Programs with instructions that have no opcode
+        of their own, which might jump, are left unchanged. The list of
+        instructions given to the constructor is not modified.
+
+        Example:
+            >>> insts = [Addi("two", "x0", 2), Mul("a", "b0", "two")]
+            >>> insts += [Div("c", "a", "two"), Add("d", "two", "two")]
+            >>> p = Program({"b0": -5}, insts)
+            >>> p.optimize()
+            >>> p.print_insts()
+            two = li 2
+            a = slli b0 1
+            c = srai a 1
+            d = li 4
+            >>> p.eval()
+            >>> p.get_val("a"), p.get_val("c"), p.get_val("d")
+            (-10, -5, 4)
+            >>> print(insts[1])
+            a = mul b0 two
+        """
+        insts = self.__insts
+        if any(inst.OP == OP_INST for inst in insts):
+            return
+        known = {"x0": 0}
+        optimized = []
+        for inst in insts:
+            op = inst.OP
+            if op in _FOLD:
+                a = known.get(inst.rs1)
+                b = known.get(inst.rs2)
+                if a is not None and b is not None and not (op == OP_DIV and b == 0):
+                    inst = Li(inst.rd, _FOLD[op](a, b))
+                elif op == OP_MUL and _log2(b) is not None:
+                    inst = Slli(inst.rd, inst.rs1, _log2(b))
+                elif op == OP_MUL and _log2(a) is not None:
+                    inst = Slli(inst.rd, inst.rs2, _log2(a))
+                elif op == OP_DIV and _log2(b) is not None:
+                    inst = Srai(inst.rd, inst.rs1, _log2(b))
+            elif op in _FOLD_IMM:
+                a = known.get(inst.rs1)
+                if a is not None:
+                    inst = Li(inst.rd, _FOLD_IMM[op](a, inst.imm))
+            if inst.OP == OP_LI:
+                known[inst.rd] = inst.imm
+            else:
+                known.pop(inst.rd, None)
+            optimized.append(inst)
+        self.__insts = optimized
+        self.__code = [inst.encode(self.__names) for inst in optimized]
+
     def eval(self):
         """
         This function evaluates a program until there is no more instructions to
@@ -92,10 +232,58 @@ class Program:
             x0: 5
             x1: 1
         """
-        inst = self.get_inst()
-        while inst:
-            inst.eval(self)
-            inst = self.get_inst()
+        # Instructions are interpreted from their encoded form in this single
+        # loop, instead of calling 'inst.eval', which in turn would call
+        # 'get_val' and 'set_val', for each of them. Operands are indices into
+        # the list of values, and reading an undefined name gives None.
+        vals = self.__vals
+        code = self.__code
+        pc = self.pc
+        try:
+            while 0 <= pc < len(code):
+                for pc, (op, rd, a, b) in enumerate(islice(code, pc, None), pc + 1):
+                    if op == OP_ADDI:
+                        vals[rd] = vals[a] + b
+                    elif op == OP_ADD:
+                        vals[rd] = vals[a] + vals[b]
+                    elif op == OP_SUB:
+                        vals[rd] = vals[a] - vals[b]
+                    elif op == OP_MUL:
+                        vals[rd] = vals[a] * vals[b]
+                    elif op == OP_SLT:
+                        vals[rd] = 1 if vals[a] < vals[b] else 0
+                    elif op == OP_SLTI:
+                        vals[rd] = 1 if vals[a] < b else 0
+                    elif op == OP_XOR:
+                        vals[rd] = vals[a] ^ vals[b]
+                    elif op == OP_XORI:
+                        vals[rd] = vals[a] ^ b
+                    elif op == OP_DIV:
+                        vals[rd] = vals[a] // vals[b]
+                    elif op == OP_LI:
+                        vals[rd] = b
+                    elif op == OP_SLLI:
+                        vals[rd] = vals[a] << b
+                    elif op == OP_SRAI:
+                        vals[rd] = vals[a] >> b
+                    else:
+                        self.pc = pc
+                        self.__insts[pc - 1].eval(self)
+                        if self.pc != pc:
+                            # The instruction jumped: resume from its target.
+                            pc = self.pc
+                            break
+        except TypeError:
+            # Either a name is undefined, or a value cannot take part in the
+            # operation. Running an encoded instruction again through 'eval'
+            # reports each case exactly as 'get_val' and Python would. Errors
+            # of instructions that were already run through 'eval' propagate.
+            inst = self.__insts[pc - 1]
+            if inst.OP != OP_INST:
+                inst.eval(self)
+            raise
+        finally:
+            self.pc = pc
 
 
 def max(a, b):
@@ -147,6 +335,7 @@ def distance_with_acceleration(V, A, T):
     p.add_inst(Mul("t2", "rs2", "t1"))
     p.add_inst(Div("t2", "t2", "two"))
     p.add_inst(Add("rd", "t0", "t2"))
+    p.optimize()
     p.eval()
     return p.get_val("rd")
 
@@ -157,12 +346,23 @@ class Inst(ABC):
     during its evaluation.
     """
 
+    __slots__ = ()
+    OP = OP_INST
+
     def __init__(self):
         pass
 
-    @abstractmethod
+    def encode(self, names):
+        """
+        Returns the instruction as a tuple (opcode, rd, rs1, rs2 or imm),
+        which is the form in which 'Program.eval' runs it. Names are replaced
+        by their indices in the mapping 'names'. Instructions without an
+        opcode of their own are evaluated by their 'eval' method.
+        """
+        return (OP_INST, None, None, None)
+
     def get_opcode(self):
-        raise NotImplementedError
+        return self.opcode
 
     @abstractmethod
     def eval(self, prog):
@@ -175,15 +375,19 @@ class BinOp(Inst):
     value, and use two values.
     """
 
+    __slots__ = ('rd', 'rs1', 'rs2')
+
     def __init__(self, rd, rs1, rs2):
         assert isinstance(rd, str) and isinstance(rs1, str) and isinstance(rs2, str)
         self.rd = rd
         self.rs1 = rs1
         self.rs2 = rs2
 
+    def encode(self, names):
+        return (self.OP, names[self.rd], names[self.rs1], names[self.rs2])
+
     def __str__(self):
-        op = self.get_opcode()
-        return f"{self.rd} = {op} {self.rs1} {self.rs2}"
+        return f"{self.rd} = {self.opcode} {self.rs1} {self.rs2}"
 
 
 class BinOpImm(Inst):
@@ -193,15 +397,19 @@ class BinOpImm(Inst):
     and one immediate constant.
     """
 
+    __slots__ = ('rd', 'rs1', 'imm')
+
     def __init__(self, rd, rs1, imm):
         assert isinstance(rd, str) and isinstance(rs1, str) and isinstance(imm, int)
         self.rd = rd
         self.rs1 = rs1
         self.imm = imm
 
+    def encode(self, names):
+        return (self.OP, names[self.rd], names[self.rs1], self.imm)
+
     def __str__(self):
-        op = self.get_opcode()
-        return f"{self.rd} = {op} {self.rs1} {self.imm}"
+        return f"{self.rd} = {self.opcode} {self.rs1} {self.imm}"
 
 
 class Add(BinOp):
@@ -219,14 +427,15 @@ class Add(BinOp):
         5
     """
 
+    __slots__ = ()
+    OP = OP_ADD
+    opcode = "add"
+
     def eval(self, prog):
         rs1 = prog.get_val(self.rs1)
         rs2 = prog.get_val(self.rs2)
         prog.set_val(self.rd, rs1 + rs2)
 
-    def get_opcode(self):
-        return "add"
-
 
 class Addi(BinOpImm):
     """
@@ -243,13 +452,14 @@ class Addi(BinOpImm):
         5
     """
 
+    __slots__ = ()
+    OP = OP_ADDI
+    opcode = "addi"
+
     def eval(self, prog):
         rs1 = prog.get_val(self.rs1)
         prog.set_val(self.rd, rs1 + self.imm)
 
-    def get_opcode(self):
-        return "addi"
-
 
 class Mul(BinOp):
     """
@@ -266,14 +476,15 @@ class Mul(BinOp):
         6
     """
 
+    __slots__ = ()
+    OP = OP_MUL
+    opcode = "mul"
+
     def eval(self, prog):
         rs1 = prog.get_val(self.rs1)
         rs2 = prog.get_val(self.rs2)
         prog.set_val(self.rd, rs1 * rs2)
 
-    def get_opcode(self):
-        return "mul"
-
 
 class Sub(BinOp):
     """
@@ -290,14 +501,15 @@ class Sub(BinOp):
         -1
     """
 
+    __slots__ = ()
+    OP = OP_SUB
+    opcode = "sub"
+
     def eval(self, prog):
         rs1 = prog.get_val(self.rs1)
         rs2 = prog.get_val(self.rs2)
         prog.set_val(self.rd, rs1 - rs2)
 
-    def get_opcode(self):
-        return "sub"
-
 
 class Xor(BinOp):
     """
@@ -314,14 +526,15 @@ class Xor(BinOp):
         1
     """
 
+    __slots__ = ()
+    OP = OP_XOR
+    opcode = "xor"
+
     def eval(self, prog):
         rs1 = prog.get_val(self.rs1)
         rs2 = prog.get_val(self.rs2)
         prog.set_val(self.rd, rs1 ^ rs2)
 
-    def get_opcode(self):
-        return "xor"
-
 
 class Xori(BinOpImm):
     """
@@ -338,13 +551,14 @@ class Xori(BinOpImm):
         1
     """
 
+    __slots__ = ()
+    OP = OP_XORI
+    opcode = "xori"
+
     def eval(self, prog):
         rs1 = prog.get_val(self.rs1)
         prog.set_val(self.rd, rs1 ^ self.imm)
 
-    def get_opcode(self):
-        return "xori"
-
 
 class Div(BinOp):
     """
@@ -363,14 +577,15 @@ class Div(BinOp):
         2
     """
 
+    __slots__ = ()
+    OP = OP_DIV
+    opcode = "div"
+
     def eval(self, prog):
         rs1 = prog.get_val(self.rs1)
         rs2 = prog.get_val(self.rs2)
         prog.set_val(self.rd, rs1 // rs2)
 
-    def get_opcode(self):
-        return "div"
-
 
 class Slt(BinOp):
     """
@@ -397,14 +612,15 @@ class Slt(BinOp):
         0
     """
 
+    __slots__ = ()
+    OP = OP_SLT
+    opcode = "slt"
+
     def eval(self, prog):
         rs1 = prog.get_val(self.rs1)
         rs2 = prog.get_val(self.rs2)
         prog.set_val(self.rd, 1 if rs1 < rs2 else 0)
 
-    def get_opcode(self):
-        return "slt"
-
 
 class Slti(BinOpImm):
     """
@@ -432,9 +648,93 @@ class Slti(BinOpImm):
         0
     """
 
+    __slots__ = ()
+    OP = OP_SLTI
+    opcode = "slti"
+
     def eval(self, prog):
         rs1 = prog.get_val(self.rs1)
         prog.set_val(self.rd, 1 if rs1 < self.imm else 0)
 
-    def get_opcode(self):
-        return "slti"
\ No newline at end of file
+
+class Slli(BinOpImm):
+    """
+    slli rd, rs1, imm: rd = rs1 << imm
+
+    Example:
+        >>> i = Slli("a", "b0", 2)
+        >>> str(i)
+        'a = slli b0 2'
+
+        >>> p = Program(env={"b0":-3}, insts=[Slli("a", "b0", 2)])
+        >>> p.eval()
+        >>> p.get_val("a")
+        -12
+    """
+
+    __slots__ = ()
+    OP = OP_SLLI
+    opcode = "slli"
+
+    def eval(self, prog):
+        rs1 = prog.get_val(self.rs1)
+        prog.set_val(self.rd, rs1 << self.imm)
+
+
+class Srai(BinOpImm):
+    """
+    srai rd, rs1, imm: rd = rs1 >> imm (arithmetic shift, which rounds
+    towards minus infinity, like the div instruction does)
+
+    Example:
+        >>> i = Srai("a", "b0", 1)
+        >>> str(i)
+        'a = srai b0 1'
+
+        >>> p = Program(env={"b0":-7}, insts=[Srai("a", "b0", 1)])
+        >>> p.eval()
+        >>> p.get_val("a")
+        -4
+    """
+
+    __slots__ = ()
+    OP = OP_SRAI
+    opcode = "srai"
+
+    def eval(self, prog):
+        rs1 = prog.get_val(self.rs1)
+        prog.set_val(self.rd, rs1 >> self.imm)
+
+
+class Li(Inst):
+    """
+    li rd, imm: rd = imm
+
+    Example:
+        >>> i = Li("a", 7)
+        >>> str(i)
+        'a = li 7'
+
+        >>> p = Program(env={}, insts=[Li("a", 7)])
+        >>> p.eval()
+        >>> p.get_val("a")
+        7
+    """
+
+    __slots__ = ('rd', 'imm')
+    OP = OP_LI
+    opcode = "li"
+
+    def __init__(self, rd, imm):
+        assert isinstance(rd, str) and isinstance(imm, int)
+        self.rd = rd
+        self.imm = imm
+
+    def encode(self, names):
+        return (self.OP, names[self.rd], None, self.imm)
+
+    def __str__(self):
+        return f"{self.rd} = {self.opcode} {self.imm}"
+
+    def eval(self, prog):
+        prog.set_val(self.rd, self.imm)
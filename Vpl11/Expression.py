@@ -3,12 +3,18 @@ This file implements the data structures that represent Expressions. You don't
 need to modify it for this assignment.
 """
 
-from abc import ABC, abstractmethod
 from Visitor import *
 
 
-class Expression(ABC):
-    @abstractmethod
+class Expression:
+    """
+    Every concrete expression has a class-level KIND, which is the position
+    of its visiting method in Visitor._table. Visitors use it to dispatch on
+    a node without going through 'accept'.
+    """
+
+    __slots__ = ()
+
     def accept(self, visitor, arg):
         raise NotImplementedError
 
@@ -19,6 +25,9 @@ class Var(Expression):
     indentifier is the value associated with it in the environment table.
     """
 
+    __slots__ = ('identifier',)
+    KIND = 0
+
     def __init__(self, identifier):
         self.identifier = identifier
 
@@ -36,6 +45,9 @@ class Bln(Expression):
     is the boolean itself.
     """
 
+    __slots__ = ('bln',)
+    KIND = 1
+
     def __init__(self, bln):
         self.bln = bln
 
@@ -52,6 +64,9 @@ class Num(Expression):
     an expression is the number itself.
     """
 
+    __slots__ = ('num',)
+    KIND = 2
+
     def __init__(self, num):
         self.num = num
 
@@ -72,14 +87,12 @@ class BinaryExpression(Expression):
     sub-expressions: the left operand and the right operand.
     """
 
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
         self.left = left
         self.right = right
 
-    @abstractmethod
-    def accept(self, visitor, arg):
-        raise NotImplementedError
-
 
 class Eql(BinaryExpression):
     """
@@ -88,6 +101,9 @@ class Eql(BinaryExpression):
     otherwise.
     """
 
+    __slots__ = ()
+    KIND = 3
+
     def accept(self, visitor, arg):
         """
         Equality doesn't need to be implemented for this exercise.
@@ -101,6 +117,9 @@ class Add(BinaryExpression):
     an expression is the addition of the two subexpression's values.
     """
 
+    __slots__ = ()
+    KIND = 4
+
     def accept(self, visitor, arg):
         """
         Example:
@@ -120,6 +139,9 @@ class Sub(BinaryExpression):
     such an expression is the subtraction of the two subexpression's values.
     """
 
+    __slots__ = ()
+    KIND = 5
+
     def accept(self, visitor, arg):
         """
         Example:
@@ -139,6 +161,9 @@ class Mul(BinaryExpression):
     such an expression is the product of the two subexpression's values.
     """
 
+    __slots__ = ()
+    KIND = 6
+
     def accept(self, visitor, arg):
         """
         Example:
@@ -159,6 +184,9 @@ class Div(BinaryExpression):
     subexpression's values.
     """
 
+    __slots__ = ()
+    KIND = 7
+
     def accept(self, visitor, arg):
         """
         Example:
@@ -186,6 +214,9 @@ class Leq(BinaryExpression):
     right operand. It is false otherwise.
     """
 
+    __slots__ = ()
+    KIND = 8
+
     def accept(self, visitor, arg):
         """
         Comparisons don't need to be implemented for this exercise.
@@ -201,6 +232,9 @@ class Lth(BinaryExpression):
     operand. It is false otherwise.
     """
 
+    __slots__ = ()
+    KIND = 9
+
     def accept(self, visitor, arg):
         """
         Comparisons don't need to be implemented for this exercise.
@@ -214,13 +248,11 @@ class UnaryExpression(Expression):
     sub-expression.
     """
 
+    __slots__ = ('exp',)
+
     def __init__(self, exp):
         self.exp = exp
 
-    @abstractmethod
-    def accept(self, visitor, arg):
-        raise NotImplementedError
-
 
 class Neg(UnaryExpression):
     """
@@ -228,6 +260,9 @@ class Neg(UnaryExpression):
     inverse of a number n is the number -n, so that the sum of both is zero.
     """
 
+    __slots__ = ()
+    KIND = 10
+
     def accept(self, visitor, arg):
         """
         Example:
@@ -251,6 +286,9 @@ class Not(UnaryExpression):
     boolean expression is the logical complement of that expression.
     """
 
+    __slots__ = ()
+    KIND = 11
+
     def accept(self, visitor, arg):
         """
         No need to implement negation for this exercise, for we don't even have
@@ -267,6 +305,9 @@ class Let(Expression):
     2. Evaluate e1 in the new environment env' = env + {v:e0_val}
     """
 
+    __slots__ = ('identifier', 'exp_def', 'exp_body')
+    KIND = 12
+
     def __init__(self, identifier, exp_def, exp_body):
         self.identifier = identifier
         self.exp_def = exp_def
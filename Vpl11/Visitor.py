@@ -14,6 +14,25 @@ class Visitor(ABC):
     subclasse will invoke the right visiting method.
     """
 
+    def __init__(self):
+        # Indexed by Expression.KIND, so that 'self._table[e.KIND](e, arg)'
+        # is the same as 'e.accept(self, arg)'.
+        self._table = [
+            self.visit_var,
+            self.visit_bln,
+            self.visit_num,
+            self.visit_eql,
+            self.visit_add,
+            self.visit_sub,
+            self.visit_mul,
+            self.visit_div,
+            self.visit_leq,
+            self.visit_lth,
+            self.visit_neg,
+            self.visit_not,
+            self.visit_let,
+        ]
+
     @abstractmethod
     def visit_var(self, exp, arg):
         pass
@@ -74,6 +93,7 @@ class GenVisitor(Visitor):
     """
 
     def __init__(self):
+        super().__init__()
         self.next_var_counter = 0
 
     def next_var_name(self):
@@ -158,8 +178,8 @@ class GenVisitor(Visitor):
         >>> p.get_val(v)
         0
         """
-        left_var = exp.left.accept(self, prog)
-        right_var = exp.right.accept(self, prog)
+        left_var = self._table[exp.left.KIND](exp.left, prog)
+        right_var = self._table[exp.right.KIND](exp.right, prog)
         diff = self.next_var_name()
         prog.add_inst(AsmModule.Sub(diff, left_var, right_var))
         lt_one = self.next_var_name()
@@ -188,8 +208,8 @@ class GenVisitor(Visitor):
         >>> p.get_val(v)
         23
         """
-        left_var = exp.left.accept(self, prog)
-        right_var = exp.right.accept(self, prog)
+        left_var = self._table[exp.left.KIND](exp.left, prog)
+        right_var = self._table[exp.right.KIND](exp.right, prog)
         dest = self.next_var_name()
         prog.add_inst(AsmModule.Add(dest, left_var, right_var))
         return dest
@@ -212,8 +232,8 @@ class GenVisitor(Visitor):
         >>> p.get_val(v)
         3
         """
-        left_var = exp.left.accept(self, prog)
-        right_var = exp.right.accept(self, prog)
+        left_var = self._table[exp.left.KIND](exp.left, prog)
+        right_var = self._table[exp.right.KIND](exp.right, prog)
         dest = self.next_var_name()
         prog.add_inst(AsmModule.Sub(dest, left_var, right_var))
         return dest
@@ -236,8 +256,8 @@ class GenVisitor(Visitor):
         >>> p.get_val(v)
         130
         """
-        left_var = exp.left.accept(self, prog)
-        right_var = exp.right.accept(self, prog)
+        left_var = self._table[exp.left.KIND](exp.left, prog)
+        right_var = self._table[exp.right.KIND](exp.right, prog)
         dest = self.next_var_name()
         prog.add_inst(AsmModule.Mul(dest, left_var, right_var))
         return dest
@@ -260,8 +280,8 @@ class GenVisitor(Visitor):
         >>> p.get_val(v)
         1
         """
-        left_var = exp.left.accept(self, prog)
-        right_var = exp.right.accept(self, prog)
+        left_var = self._table[exp.left.KIND](exp.left, prog)
+        right_var = self._table[exp.right.KIND](exp.right, prog)
         dest = self.next_var_name()
         prog.add_inst(AsmModule.Div(dest, left_var, right_var))
         return dest
@@ -316,8 +336,8 @@ class GenVisitor(Visitor):
         >>> p.get_val(v)
         0
         """
-        left_var = exp.left.accept(self, prog)
-        right_var = exp.right.accept(self, prog)
+        left_var = self._table[exp.left.KIND](exp.left, prog)
+        right_var = self._table[exp.right.KIND](exp.right, prog)
         lower_than = self.next_var_name()
         prog.add_inst(AsmModule.Slt(lower_than, right_var, left_var))
         dest = self.next_var_name()
@@ -350,8 +370,8 @@ class GenVisitor(Visitor):
         >>> p.get_val(v)
         1
         """
-        left_var = exp.left.accept(self, prog)
-        right_var = exp.right.accept(self, prog)
+        left_var = self._table[exp.left.KIND](exp.left, prog)
+        right_var = self._table[exp.right.KIND](exp.right, prog)
         dest = self.next_var_name()
         prog.add_inst(AsmModule.Slt(dest, left_var, right_var))
         return dest
@@ -382,7 +402,7 @@ class GenVisitor(Visitor):
         >>> p.get_val(v)
         3
         """
-        operand = exp.exp.accept(self, prog)
+        operand = self._table[exp.exp.KIND](exp.exp, prog)
         dest = self.next_var_name()
         prog.add_inst(AsmModule.Sub(dest, "x0", operand))
         return dest
@@ -429,7 +449,7 @@ class GenVisitor(Visitor):
         >>> p.get_val(v)
         0
         """
-        operand = exp.exp.accept(self, prog)
+        operand = self._table[exp.exp.KIND](exp.exp, prog)
         lt_one = self.next_var_name()
         prog.add_inst(AsmModule.Slti(lt_one, operand, 1))
         lt_zero = self.next_var_name()
@@ -466,6 +486,6 @@ class GenVisitor(Visitor):
             >>> p.get_val(v)
             50
         """
-        value_var = exp.exp_def.accept(self, prog)
+        value_var = self._table[exp.exp_def.KIND](exp.exp_def, prog)
         prog.add_inst(AsmModule.Add(exp.identifier, value_var, "x0"))
-        return exp.exp_body.accept(self, prog)
\ No newline at end of file
+        return self._table[exp.exp_body.KIND](exp.exp_body, prog)
\ No newline at end of file
@@ -24,6 +24,10 @@ from collections import deque
 from abc import ABC, abstractmethod
 
 
+# Marks a name that has no value in the environment.
+_UNBOUND = object()
+
+
 class Program:
     """
     The 'Program' is a list of instructions plus an environment that associates
@@ -63,10 +67,10 @@ class Program:
         >>> p.get_val("x0")
         0
         """
-        if name in self.__env:
-            return self.__env[name]
-        else:
+        val = self.__env.get(name, _UNBOUND)
+        if val is _UNBOUND:
             sys.exit("Def error")
+        return val
 
     def print_env(self):
         for name, val in sorted(self.__env.items()):
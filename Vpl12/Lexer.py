@@ -58,6 +58,24 @@ class TokenType(enum.Enum):
     LGC = 223  # The boolean (logic) type ('bool')
 
 
+_KEYWORDS = {
+    "let": TokenType.LET,
+    "in": TokenType.INX,
+    "end": TokenType.END,
+    "true": TokenType.TRU,
+    "false": TokenType.FLS,
+    "if": TokenType.IFX,
+    "then": TokenType.THN,
+    "else": TokenType.ELS,
+    "or": TokenType.ORX,
+    "and": TokenType.AND,
+    "not": TokenType.NOT,
+    "fn": TokenType.FNX,
+    "int": TokenType.INT,
+    "bool": TokenType.LGC,
+}
+
+
 class Lexer:
     
     def __init__(self, source):
@@ -150,22 +168,19 @@ class Lexer:
 
             if current_char == "-" and self._peek_next() == "-":
                 start = self.position
-                self.position += 2
-                while self.position < self.length and self.source[self.position] != "\n":
-                    self.position += 1
-                text = self.source[start:self.position]
-                return Token(text, TokenType.COM)
+                end = self.source.find("\n", start + 2)
+                if end < 0:
+                    end = self.length
+                self.position = end
+                return Token(self.source[start:end], TokenType.COM)
 
             if current_char == "(" and self._peek_next() == "*":
                 start = self.position
-                self.position += 2
-                while self.position < self.length - 1:
-                    if self.source[self.position] == "*" and self.source[self.position + 1] == ")":
-                        self.position += 2
-                        text = self.source[start:self.position]
-                        return Token(text, TokenType.COM)
-                    self.position += 1
-                raise ValueError("Unterminated block comment")
+                end = self.source.find("*)", start + 2)
+                if end < 0:
+                    raise ValueError("Unterminated block comment")
+                self.position = end + 2
+                return Token(self.source[start:end + 2], TokenType.COM)
 
             if current_char.isdigit():
                 start = self.position
@@ -179,23 +194,7 @@ class Lexer:
                 while self.position < self.length and (self.source[self.position].isalnum() or self.source[self.position] == "_"):
                     self.position += 1
                 text = self.source[start:self.position]
-                keywords = {
-                    "let": TokenType.LET,
-                    "in": TokenType.INX,
-                    "end": TokenType.END,
-                    "true": TokenType.TRU,
-                    "false": TokenType.FLS,
-                    "if": TokenType.IFX,
-                    "then": TokenType.THN,
-                    "else": TokenType.ELS,
-                    "or": TokenType.ORX,
-                    "and": TokenType.AND,
-                    "not": TokenType.NOT,
-                    "fn": TokenType.FNX,
-                    "int": TokenType.INT,
-                    "bool": TokenType.LGC,
-                }
-                token_kind = keywords.get(text, TokenType.VAR)
+                token_kind = _KEYWORDS.get(text, TokenType.VAR)
                 return Token(text, token_kind)
 
             current_char = self._advance()
@@ -26,6 +26,10 @@ from collections import deque
 from abc import ABC, abstractmethod
 
 
+# Marks a name that has no value in the environment.
+_UNBOUND = object()
+
+
 class Program:
     """
     The 'Program' is a list of instructions plus an environment that associates
@@ -72,10 +76,10 @@ class Program:
         >>> p.get_val("x0")
         0
         """
-        if name in self.__env:
-            return self.__env[name]
-        else:
+        val = self.__env.get(name, _UNBOUND)
+        if val is _UNBOUND:
             sys.exit("Def error")
+        return val
 
     def print_env(self):
         for name, val in sorted(self.__env.items()):
@@ -114,11 +118,42 @@ class Program:
             b1: 3
             x0: 0
         """
-        inst = self.get_inst()
-        while inst:
-            inst.eval(self)
-            inst = self.get_inst()
-
+        # Each instruction is encoded as a tuple (handler, a, b, c), where the
+        # handler is one of the functions below, which runs the instruction
+        # and returns the next pc. Registers are replaced by indices into the
+        # list 'regs', which holds their values during the run, and which is
+        # written back to the environment at the end. Encoding happens here,
+        # and not in 'add_inst', because branch targets may be set after the
+        # branch is added to the program.
+        names = _Names()
+        code = [inst.encode(names) for inst in self.__insts]
+        env = self.__env
+        regs = [env.get(name) for name in names]
+        regs.append(None)  # Written by instructions whose destination is x0.
+        n = len(code)
+        pc = self.pc
+        try:
+            while 0 <= pc < n:
+                handler, a, b, c = code[pc]
+                pc += 1
+                pc = handler(regs, pc, a, b, c)
+        except TypeError:
+            # Either a register is undefined, or a value cannot take part in
+            # the operation. Running the instruction again through 'eval'
+            # reports each case exactly as 'get_val' and Python would.
+            self.__write_back(names, regs)
+            self.__insts[pc - 1].eval(self, pc)
+            raise
+        finally:
+            self.__write_back(names, regs)
+            self.pc = pc
+
+    def __write_back(self, names, regs):
+        env = self.__env
+        for name, idx in names.items():
+            val = regs[idx]
+            if val is not None:
+                env[name] = val
 
 def max(a, b):
     """
@@ -173,6 +208,111 @@ def distance_with_acceleration(V, A, T):
     return p.get_val("rd")
 
 
+class _Names(dict):
+    """
+    Maps register names to their indices in the list of values that
+    'Program.eval' runs on. Looking up a name that is not there yet gives it
+    the next index.
+    """
+
+    __slots__ = ()
+
+    def __missing__(self, name):
+        idx = self[name] = len(self)
+        return idx
+
+    def dest(self, name):
+        """
+        Returns the index that an instruction writing on 'name' stores into.
+        Writes on x0 go to the extra slot at the end of the list (index -1),
+        which is never read, so x0 keeps its zero.
+        """
+        return -1 if name == "x0" else self[name]
+
+
+# The handlers of the encoded instructions (see 'Inst.encode'). Each one takes
+# the list of register values, the address of the next instruction and the
+# operands of the instruction, and returns the address of the instruction
+# that must run next. An undefined register holds None, and reading it raises
+# TypeError, which 'Program.eval' turns into the error of 'get_val'.
+
+def _undefined():
+    raise TypeError("undefined register")
+
+
+def _beq(regs, pc, rs1, rs2, lab):
+    a = regs[rs1]
+    b = regs[rs2]
+    if a is None or b is None:
+        _undefined()
+    return lab if a == b else pc
+
+
+def _beq_same(regs, pc, rs, _, lab):
+    if regs[rs] is None:
+        _undefined()
+    return lab
+
+
+def _jal(regs, pc, rd, lab, _):
+    regs[rd] = pc
+    return lab
+
+
+def _j(regs, pc, lab, _, __):
+    return lab
+
+
+def _add(regs, pc, rd, rs1, rs2):
+    regs[rd] = regs[rs1] + regs[rs2]
+    return pc
+
+
+def _addi(regs, pc, rd, rs1, imm):
+    regs[rd] = regs[rs1] + imm
+    return pc
+
+
+def _li(regs, pc, rd, imm, _):
+    regs[rd] = imm
+    return pc
+
+
+def _mul(regs, pc, rd, rs1, rs2):
+    regs[rd] = regs[rs1] * regs[rs2]
+    return pc
+
+
+def _sub(regs, pc, rd, rs1, rs2):
+    regs[rd] = regs[rs1] - regs[rs2]
+    return pc
+
+
+def _xor(regs, pc, rd, rs1, rs2):
+    regs[rd] = regs[rs1] ^ regs[rs2]
+    return pc
+
+
+def _xori(regs, pc, rd, rs1, imm):
+    regs[rd] = regs[rs1] ^ imm
+    return pc
+
+
+def _div(regs, pc, rd, rs1, rs2):
+    regs[rd] = regs[rs1] // regs[rs2]
+    return pc
+
+
+def _slt(regs, pc, rd, rs1, rs2):
+    regs[rd] = 1 if regs[rs1] < regs[rs2] else 0
+    return pc
+
+
+def _slti(regs, pc, rd, rs1, imm):
+    regs[rd] = 1 if regs[rs1] < imm else 0
+    return pc
+
+
 class Inst(ABC):
     """
     The representation of instructions. Every instruction refers to a program
@@ -182,12 +322,24 @@ class Inst(ABC):
     def __init__(self):
         pass
 
-    @abstractmethod
     def get_opcode(self):
-        raise NotImplementedError
+        return self.opcode
 
     @abstractmethod
-    def eval(self, prog):
+    def eval(self, prog, pc):
+        """
+        Runs the instruction on prog, where pc is the address of the next
+        instruction, and returns the address of the instruction that must run
+        next.
+        """
+        raise NotImplementedError
+
+    def encode(self, names):
+        """
+        Returns the instruction as a tuple (handler, a, b, c), which is the
+        form in which 'Program.eval' runs it. Registers are replaced by their
+        indices in 'names', a '_Names' mapping.
+        """
         raise NotImplementedError
 
 
@@ -209,24 +361,31 @@ class Beq(BranchOp):
     Jumps to label lab if the value in rs1 is equal to the value in rs2.
     """
 
+    opcode = "beq"
+
     def __init__(self, rs1, rs2, lab=None):
         assert isinstance(rs1, str) and isinstance(rs2, str)
         self.rs1 = rs1
         self.rs2 = rs2
-        if lab != None:
-            assert isinstance(lab, int)
+        assert lab is None or isinstance(lab, int)
         self.lab = lab
 
-    def get_opcode(self):
-        return "beq"
+    def encode(self, names):
+        # Comparing a register with itself always jumps, once the register is
+        # known to be defined, and x0 is always defined.
+        if self.rs1 == self.rs2:
+            if self.rs1 == "x0":
+                return (_j, self.lab, None, None)
+            return (_beq_same, names[self.rs1], None, self.lab)
+        return (_beq, names[self.rs1], names[self.rs2], self.lab)
 
     def __str__(self):
-        op = self.get_opcode()
-        return f"{op} {self.rs1} {self.rs2} {self.lab}"
+        return f"{self.opcode} {self.rs1} {self.rs2} {self.lab}"
 
-    def eval(self, prog):
+    def eval(self, prog, pc):
         if prog.get_val(self.rs1) == prog.get_val(self.rs2):
-            prog.set_pc(self.lab)
+            return self.lab
+        return pc
 
 
 class Jal(BranchOp):
@@ -237,24 +396,26 @@ class Jal(BranchOp):
     that `jal x0 lab` is equivalent to an unconditional jump to `lab`.
     """
 
+    opcode = "jal"
+
     def __init__(self, rd, lab=None):
         assert isinstance(rd, str)
         self.rd = rd
-        if lab != None:
-            assert isinstance(lab, int)
+        assert lab is None or isinstance(lab, int)
         self.lab = lab
 
-    def get_opcode(self):
-        return "jal"
+    def encode(self, names):
+        if self.rd == "x0":
+            return (_j, self.lab, None, None)
+        return (_jal, names.dest(self.rd), self.lab, None)
 
     def __str__(self):
-        op = self.get_opcode()
-        return f"{op} {self.rd} {self.lab}"
+        return f"{self.opcode} {self.rd} {self.lab}"
 
-    def eval(self, prog):
+    def eval(self, prog, pc):
         if self.rd != "x0":
-            self.rd = prog.get_pc + 1
-        prog.set_pc(self.lab)
+            prog.set_val(self.rd, pc)
+        return self.lab
 
 
 class BinOp(Inst):
@@ -271,8 +432,7 @@ class BinOp(Inst):
         self.rs2 = rs2
 
     def __str__(self):
-        op = self.get_opcode()
-        return f"{self.rd} = {op} {self.rs1} {self.rs2}"
+        return f"{self.rd} = {self.opcode} {self.rs1} {self.rs2}"
 
 
 class BinOpImm(Inst):
@@ -289,8 +449,7 @@ class BinOpImm(Inst):
         self.imm = imm
 
     def __str__(self):
-        op = self.get_opcode()
-        return f"{self.rd} = {op} {self.rs1} {self.imm}"
+        return f"{self.rd} = {self.opcode} {self.rs1} {self.imm}"
 
 
 class Add(BinOp):
@@ -308,13 +467,16 @@ class Add(BinOp):
         5
     """
 
-    def eval(self, prog):
+    opcode = "add"
+
+    def eval(self, prog, pc):
         rs1 = prog.get_val(self.rs1)
         rs2 = prog.get_val(self.rs2)
         prog.set_val(self.rd, rs1 + rs2)
+        return pc
 
-    def get_opcode(self):
-        return "add"
+    def encode(self, names):
+        return (_add, names.dest(self.rd), names[self.rs1], names[self.rs2])
 
 
 class Addi(BinOpImm):
@@ -332,12 +494,19 @@ class Addi(BinOpImm):
         5
     """
 
-    def eval(self, prog):
+    opcode = "addi"
+
+    def eval(self, prog, pc):
         rs1 = prog.get_val(self.rs1)
         prog.set_val(self.rd, rs1 + self.imm)
+        return pc
 
-    def get_opcode(self):
-        return "addi"
+    def encode(self, names):
+        if self.rs1 == "x0":
+            # 'addi rd, x0, imm' is how constants are loaded. The sum with
+            # x0 is kept, so that a bool immediate still loads an int.
+            return (_li, names.dest(self.rd), 0 + self.imm, None)
+        return (_addi, names.dest(self.rd), names[self.rs1], self.imm)
 
 
 class Mul(BinOp):
@@ -355,13 +524,16 @@ class Mul(BinOp):
         6
     """
 
-    def eval(self, prog):
+    opcode = "mul"
+
+    def eval(self, prog, pc):
         rs1 = prog.get_val(self.rs1)
         rs2 = prog.get_val(self.rs2)
         prog.set_val(self.rd, rs1 * rs2)
+        return pc
 
-    def get_opcode(self):
-        return "mul"
+    def encode(self, names):
+        return (_mul, names.dest(self.rd), names[self.rs1], names[self.rs2])
 
 
 class Sub(BinOp):
@@ -379,13 +551,16 @@ class Sub(BinOp):
         -1
     """
 
-    def eval(self, prog):
+    opcode = "sub"
+
+    def eval(self, prog, pc):
         rs1 = prog.get_val(self.rs1)
         rs2 = prog.get_val(self.rs2)
         prog.set_val(self.rd, rs1 - rs2)
+        return pc
 
-    def get_opcode(self):
-        return "sub"
+    def encode(self, names):
+        return (_sub, names.dest(self.rd), names[self.rs1], names[self.rs2])
 
 
 class Xor(BinOp):
@@ -403,13 +578,16 @@ class Xor(BinOp):
         1
     """
 
-    def eval(self, prog):
+    opcode = "xor"
+
+    def eval(self, prog, pc):
         rs1 = prog.get_val(self.rs1)
         rs2 = prog.get_val(self.rs2)
         prog.set_val(self.rd, rs1 ^ rs2)
+        return pc
 
-    def get_opcode(self):
-        return "xor"
+    def encode(self, names):
+        return (_xor, names.dest(self.rd), names[self.rs1], names[self.rs2])
 
 
 class Xori(BinOpImm):
@@ -427,12 +605,15 @@ class Xori(BinOpImm):
         1
     """
 
-    def eval(self, prog):
+    opcode = "xori"
+
+    def eval(self, prog, pc):
         rs1 = prog.get_val(self.rs1)
         prog.set_val(self.rd, rs1 ^ self.imm)
+        return pc
 
-    def get_opcode(self):
-        return "xori"
+    def encode(self, names):
+        return (_xori, names.dest(self.rd), names[self.rs1], self.imm)
 
 
 class Div(BinOp):
@@ -452,13 +633,16 @@ class Div(BinOp):
         2
     """
 
-    def eval(self, prog):
+    opcode = "div"
+
+    def eval(self, prog, pc):
         rs1 = prog.get_val(self.rs1)
         rs2 = prog.get_val(self.rs2)
         prog.set_val(self.rd, rs1 // rs2)
+        return pc
 
-    def get_opcode(self):
-        return "div"
+    def encode(self, names):
+        return (_div, names.dest(self.rd), names[self.rs1], names[self.rs2])
 
 
 class Slt(BinOp):
@@ -486,13 +670,16 @@ class Slt(BinOp):
         0
     """
 
-    def eval(self, prog):
+    opcode = "slt"
+
+    def eval(self, prog, pc):
         rs1 = prog.get_val(self.rs1)
         rs2 = prog.get_val(self.rs2)
         prog.set_val(self.rd, 1 if rs1 < rs2 else 0)
+        return pc
 
-    def get_opcode(self):
-        return "slt"
+    def encode(self, names):
+        return (_slt, names.dest(self.rd), names[self.rs1], names[self.rs2])
 
 
 class Slti(BinOpImm):
@@ -521,9 +708,12 @@ class Slti(BinOpImm):
         0
     """
 
-    def eval(self, prog):
+    opcode = "slti"
+
+    def eval(self, prog, pc):
         rs1 = prog.get_val(self.rs1)
         prog.set_val(self.rd, 1 if rs1 < self.imm else 0)
+        return pc
 
-    def get_opcode(self):
-        return "slti"
\ No newline at end of file
+    def encode(self, names):
+        return (_slti, names.dest(self.rd), names[self.rs1], self.imm)
\ No newline at end of file
@@ -1,8 +1,12 @@
-from abc import ABC, abstractmethod
 from Visitor import *
 
-class Expression(ABC):
-    @abstractmethod
+class Expression:
+    """
+    Every concrete expression has a class-level KIND, which is the position
+    of its visiting method in a visitor's _table. Visitors use it to dispatch
+    on a node without going through 'accept'.
+    """
+    __slots__ = ()
     def accept(self, visitor, arg):
         raise NotImplementedError
 
@@ -11,6 +15,8 @@ class Var(Expression):
     This class represents expressions that are identifiers. The value of an
     indentifier is the value associated with it in the environment table.
     """
+    __slots__ = ('identifier',)
+    KIND = 0
     def __init__(self, identifier):
         self.identifier = identifier
     def accept(self, visitor, arg):
@@ -22,6 +28,8 @@ class Bln(Expression):
     two boolean values: true and false. The acceptuation of such an expression is
     the boolean itself.
     """
+    __slots__ = ('bln',)
+    KIND = 1
     def __init__(self, bln):
         self.bln = bln
     def accept(self, visitor, arg):
@@ -32,6 +40,8 @@ class Num(Expression):
     This class represents expressions that are numbers. The acceptuation of such
     an expression is the number itself.
     """
+    __slots__ = ('num',)
+    KIND = 2
     def __init__(self, num):
         self.num = num
     def accept(self, visitor, arg):
@@ -42,20 +52,19 @@ class BinaryExpression(Expression):
     This class represents binary expressions. A binary expression has two
     sub-expressions: the left operand and the right operand.
     """
+    __slots__ = ('left', 'right')
     def __init__(self, left, right):
         self.left = left
         self.right = right
 
-    @abstractmethod
-    def accept(self, visitor, arg):
-        raise NotImplementedError
-
 class Eql(BinaryExpression):
     """
     This class represents the equality between two expressions. The acceptuation
     of such an expression is True if the subexpressions are the same, or false
     otherwise.
     """
+    __slots__ = ()
+    KIND = 3
     def accept(self, visitor, arg):
         return visitor.visit_eql(self, arg)
 
@@ -64,6 +73,8 @@ class Add(BinaryExpression):
     This class represents addition of two expressions. The acceptuation of such
     an expression is the addition of the two subexpression's values.
     """
+    __slots__ = ()
+    KIND = 6
     def accept(self, visitor, arg):
         return visitor.visit_add(self, arg)
 
@@ -73,6 +84,8 @@ class And(BinaryExpression):
     The evaluation of an expression of this kind is the logical AND of the two
     subexpression's values.
     """
+    __slots__ = ()
+    KIND = 4
     def accept(self, visitor, arg):
         return visitor.visit_and(self, arg)
 
@@ -82,6 +95,8 @@ class Or(BinaryExpression):
     The evaluation of an expression of this kind is the logical OR of the two
     subexpression's values.
     """
+    __slots__ = ()
+    KIND = 5
     def accept(self, visitor, arg):
         return visitor.visit_or(self, arg)
 
@@ -90,6 +105,8 @@ class Sub(BinaryExpression):
     This class represents subtraction of two expressions. The acceptuation of such
     an expression is the subtraction of the two subexpression's values.
     """
+    __slots__ = ()
+    KIND = 7
     def accept(self, visitor, arg):
         return visitor.visit_sub(self, arg)
 
@@ -98,6 +115,8 @@ class Mul(BinaryExpression):
     This class represents multiplication of two expressions. The acceptuation of
     such an expression is the product of the two subexpression's values.
     """
+    __slots__ = ()
+    KIND = 8
     def accept(self, visitor, arg):
         return visitor.visit_mul(self, arg)
 
@@ -107,6 +126,8 @@ class Div(BinaryExpression):
     acceptuation of such an expression is the integer quocient of the two
     subexpression's values.
     """
+    __slots__ = ()
+    KIND = 9
     def accept(self, visitor, arg):
         return visitor.visit_div(self, arg)
 
@@ -117,6 +138,8 @@ class Leq(BinaryExpression):
     boolean value that is true if the left operand is less than or equal the
     right operand. It is false otherwise.
     """
+    __slots__ = ()
+    KIND = 10
     def accept(self, visitor, arg):
         return visitor.visit_leq(self, arg)
 
@@ -127,6 +150,8 @@ class Lth(BinaryExpression):
     boolean value that is true if the left operand is less than the right
     operand. It is false otherwise.
     """
+    __slots__ = ()
+    KIND = 11
     def accept(self, visitor, arg):
         return visitor.visit_lth(self, arg)
 
@@ -135,18 +160,17 @@ class UnaryExpression(Expression):
     This class represents unary expressions. A unary expression has only one
     sub-expression.
     """
+    __slots__ = ('exp',)
     def __init__(self, exp):
         self.exp = exp
 
-    @abstractmethod
-    def accept(self, visitor, arg):
-        raise NotImplementedError
-
 class Neg(UnaryExpression):
     """
     This expression represents the additive inverse of a number. The additive
     inverse of a number n is the number -n, so that the sum of both is zero.
     """
+    __slots__ = ()
+    KIND = 12
     def accept(self, visitor, arg):
         return visitor.visit_neg(self, arg)
 
@@ -155,6 +179,8 @@ class Not(UnaryExpression):
     This expression represents the negation of a boolean. The negation of a
     boolean expression is the logical complement of that expression.
     """
+    __slots__ = ()
+    KIND = 13
     def accept(self, visitor, arg):
         return visitor.visit_not(self, arg)
 
@@ -165,6 +191,8 @@ class Let(Expression):
     1. Evaluate e0 in the environment env, yielding e0_val
     2. Evaluate e1 in the new environment env' = env + {v:e0_val}
     """
+    __slots__ = ('identifier', 'exp_def', 'exp_body')
+    KIND = 14
     def __init__(self, identifier, exp_def, exp_body):
         self.identifier = identifier
         self.exp_def = exp_def
@@ -182,6 +210,8 @@ class IfThenElse(Expression):
     Notice that we only evaluate one of the two sub-expressions, not both. Thus,
     "if True then 0 else 1 div 0" will return 0 indeed.
     """
+    __slots__ = ('cond', 'e0', 'e1')
+    KIND = 15
     def __init__(self, cond, e0, e1):
         self.cond = cond
         self.e0 = e0
@@ -23,14 +23,103 @@ References:
     see https://www.engr.mun.ca/~theo/Misc/exp_parsing.htm#classic
 """
 
+# Literal nodes are never mutated by the visitors (RenameVisitor only touches
+# Var and Let), so identical literals can share a single node.
+_NUM_CACHE = {}
+_TRUE_BLN = Bln(True)
+_FALSE_BLN = Bln(False)
+
+
+def _num(value):
+    num = _NUM_CACHE.get(value)
+    if num is None:
+        num = _NUM_CACHE[value] = Num(value)
+    return num
+
+
+def _bln(value):
+    return _TRUE_BLN if value else _FALSE_BLN
+
+
+# Operations that can be evaluated at parse time when both operands are
+# literals. The results follow the code that GenVisitor would emit: booleans
+# are 0/1 and division rounds towards minus infinity. Division by zero is left
+# for the program to fail at run time.
+_FOLD_NUM = {
+    Add: lambda a, b: _num(a + b),
+    Sub: lambda a, b: _num(a - b),
+    Mul: lambda a, b: _num(a * b),
+    Div: lambda a, b: _num(a // b) if b else None,
+    Eql: lambda a, b: _bln(a == b),
+    Leq: lambda a, b: _bln(a <= b),
+    Lth: lambda a, b: _bln(a < b),
+}
+_FOLD_BLN = {
+    Eql: lambda a, b: _bln(a == b),
+}
+
+
+def _fold_binary(ctor, left, right):
+    """
+    Builds ctor(left, right), replacing it with a literal when both operands
+    are literals of a kind that the operation can fold. A boolean literal on
+    the left of 'and'/'or' decides the result on its own, or leaves it to the
+    right operand, exactly as the short-circuit code would.
+    """
+    left_type = type(left)
+    if left_type is Bln and (ctor is And or ctor is Or):
+        return left if left.bln == (ctor is Or) else right
+    if left_type is type(right):
+        if left_type is Num:
+            fold = _FOLD_NUM.get(ctor)
+            if fold is not None:
+                node = fold(left.num, right.num)
+                if node is not None:
+                    return node
+        elif left_type is Bln:
+            fold = _FOLD_BLN.get(ctor)
+            if fold is not None:
+                return fold(left.bln, right.bln)
+    return ctor(left, right)
+
+
+def _fold_if(cond, e0, e1):
+    """
+    Builds IfThenElse(cond, e0, e1), or the branch that a literal boolean
+    condition selects. The other branch would never run, so dropping it does
+    not change the program.
+    """
+    if type(cond) is Bln:
+        return e0 if cond.bln else e1
+    return IfThenElse(cond, e0, e1)
+
+# Binary operators, from the loosest to the tightest binding. Each entry maps
+# the token kind to its precedence and to the node that it builds.
+_BINARY_OPS = {
+    TokenType.ORX: (1, Or),
+    TokenType.AND: (2, And),
+    TokenType.EQL: (3, Eql),
+    TokenType.LEQ: (4, Leq),
+    TokenType.LTH: (4, Lth),
+    TokenType.ADD: (5, Add),
+    TokenType.SUB: (5, Sub),
+    TokenType.MUL: (6, Mul),
+    TokenType.DIV: (6, Div),
+}
+_LOWEST_PREC = 1
+
 class Parser:
     def __init__(self, tokens):
         """
         Initializes the parser. The parser keeps track of the list of tokens
         and the current token. For instance:
         """
-        self.tokens = list(tokens)
-        self.tokens.append(Token("", TokenType.EOF))
+        # The tokens are split into two parallel tuples, one with the kinds
+        # and another with the texts, so that parsing rules read a kind with a
+        # single subscript. Both end with the EOF sentinel.
+        tokens = tuple(tokens)
+        self.kinds = (*[token.kind for token in tokens], TokenType.EOF)
+        self.texts = (*[token.text for token in tokens], "")
         self.cur_token_idx = 0 # This is just a suggestion!
         # You can (and probably should!) modify this method. Ok!
 
@@ -240,35 +329,19 @@ class Parser:
         return expr
 
     def _parse_expression(self):
-        if self._current().kind == TokenType.IFX:
+        if self.kinds[self.cur_token_idx] == TokenType.IFX:
             self._advance()
-            cond = self._parse_or()
+            cond = self._parse_binary(_LOWEST_PREC)
             self._expect(TokenType.THN)
             e0 = self._parse_expression()
             self._expect(TokenType.ELS)
             e1 = self._parse_expression()
-            return IfThenElse(cond, e0, e1)
-        return self._parse_or()
-
-    def _parse_and(self):
-        left = self._parse_equality()
-        while self._current().kind == TokenType.AND:
-            self._advance()
-            right = self._parse_equality()
-            left = And(left, right)
-        return left
-
-    def _parse_or(self):
-        left = self._parse_and()
-        while self._current().kind == TokenType.ORX:
-            self._advance()
-            right = self._parse_and()
-            left = Or(left, right)
-        return left
+            return _fold_if(cond, e0, e1)
+        return self._parse_binary(_LOWEST_PREC)
 
     def _parse_let(self):
         self._expect(TokenType.LET)
-        identifier = self._expect(TokenType.VAR).text
+        identifier = self._expect(TokenType.VAR)
         self._expect(TokenType.ASN)
         exp_def = self._parse_expression()
         self._expect(TokenType.INX)
@@ -276,122 +349,105 @@ class Parser:
         self._expect(TokenType.END)
         return Let(identifier, exp_def, exp_body)
 
-    def _parse_equality(self):
-        left = self._parse_comparison()
-        while self._current().kind == TokenType.EQL:
-            self._advance()
-            right = self._parse_comparison()
-            left = Eql(left, right)
-        return left
-
-    def _parse_comparison(self):
-        left = self._parse_additive()
-        while True:
-            token_kind = self._current().kind
-            if token_kind == TokenType.LEQ:
-                self._advance()
-                right = self._parse_additive()
-                left = Leq(left, right)
-            elif token_kind == TokenType.LTH:
-                self._advance()
-                right = self._parse_additive()
-                left = Lth(left, right)
-            else:
-                break
-        return left
-
-    def _parse_additive(self):
-        left = self._parse_multiplicative()
-        while True:
-            token_kind = self._current().kind
-            if token_kind == TokenType.ADD:
-                self._advance()
-                right = self._parse_multiplicative()
-                left = Add(left, right)
-            elif token_kind == TokenType.SUB:
-                self._advance()
-                right = self._parse_multiplicative()
-                left = Sub(left, right)
-            else:
-                break
-        return left
-
-    def _parse_multiplicative(self):
+    def _parse_binary(self, min_prec):
+        """
+        Parses a chain of binary operators whose precedence is at least
+        min_prec. All binary operators are left associative, so the right
+        operand only accepts operators that bind strictly tighter.
+        """
+        kinds = self.kinds
         left = self._parse_unary()
         while True:
-            token_kind = self._current().kind
-            if token_kind == TokenType.MUL:
-                self._advance()
-                right = self._parse_unary()
-                left = Mul(left, right)
-            elif token_kind == TokenType.DIV:
-                self._advance()
-                right = self._parse_unary()
-                left = Div(left, right)
-            else:
-                break
-        return left
+            op = _BINARY_OPS.get(kinds[self.cur_token_idx])
+            if op is None or op[0] < min_prec:
+                return left
+            # An operator is never the EOF token, so no bounds check is needed.
+            self.cur_token_idx += 1
+            prec, ctor = op
+            left = _fold_binary(ctor, left, self._parse_binary(prec + 1))
 
     def _parse_unary(self):
-        token_kind = self._current().kind
+        kinds = self.kinds
+        token_kind = kinds[self.cur_token_idx]
         if token_kind == TokenType.NEG:
-            self._advance()
+            self.cur_token_idx += 1
+            next_kind = kinds[self.cur_token_idx]
+            # A negative literal is read in one step, without a nested call.
+            if next_kind == TokenType.NUM:
+                text = self.texts[self.cur_token_idx]
+                self.cur_token_idx += 1
+                return _num(-int(text))
             # Unary minus cannot be immediately followed by an 'if' expression
-            if self._current().kind == TokenType.IFX:
+            if next_kind == TokenType.IFX:
                 self._error("")
-            return Neg(self._parse_unary())
+            operand = self._parse_unary()
+            if type(operand) is Num:
+                return _num(-operand.num)
+            return Neg(operand)
         if token_kind == TokenType.NOT:
-            self._advance()
-            if self._current().kind == TokenType.IFX:
+            self.cur_token_idx += 1
+            next_kind = kinds[self.cur_token_idx]
+            if next_kind == TokenType.TRU:
+                self.cur_token_idx += 1
+                return _FALSE_BLN
+            if next_kind == TokenType.FLS:
+                self.cur_token_idx += 1
+                return _TRUE_BLN
+            if next_kind == TokenType.IFX:
                 self._error("")
-            return Not(self._parse_unary())
+            operand = self._parse_unary()
+            if type(operand) is Bln:
+                return _bln(not operand.bln)
+            return Not(operand)
         return self._parse_primary()
 
     def _parse_primary(self):
-        token = self._current()
-        if token.kind == TokenType.NUM:
-            self._advance()
-            return Num(int(token.text))
-        if token.kind == TokenType.TRU:
-            self._advance()
-            return Bln(True)
-        if token.kind == TokenType.FLS:
-            self._advance()
-            return Bln(False)
-        if token.kind == TokenType.VAR:
-            self._advance()
-            return Var(token.text)
-        if token.kind == TokenType.LPR:
-            self._advance()
+        kind = self.kinds[self.cur_token_idx]
+        if kind == TokenType.NUM:
+            text = self.texts[self.cur_token_idx]
+            self.cur_token_idx += 1
+            return _num(int(text))
+        if kind == TokenType.TRU:
+            self.cur_token_idx += 1
+            return _TRUE_BLN
+        if kind == TokenType.FLS:
+            self.cur_token_idx += 1
+            return _FALSE_BLN
+        if kind == TokenType.VAR:
+            text = self.texts[self.cur_token_idx]
+            self.cur_token_idx += 1
+            return Var(text)
+        if kind == TokenType.LPR:
+            self.cur_token_idx += 1
             expr = self._parse_expression()
             self._expect(TokenType.RPR)
             return expr
-        if token.kind == TokenType.LET:
+        if kind == TokenType.LET:
             return self._parse_let()
-        if token.kind == TokenType.IFX:
+        if kind == TokenType.IFX:
             # allow nested 'if' expressions in primary position
-            self._advance()
-            cond = self._parse_or()
+            self.cur_token_idx += 1
+            cond = self._parse_binary(_LOWEST_PREC)
             self._expect(TokenType.THN)
             e0 = self._parse_expression()
             self._expect(TokenType.ELS)
             e1 = self._parse_expression()
-            return IfThenElse(cond, e0, e1)
+            return _fold_if(cond, e0, e1)
         self._error("")
 
-    def _current(self):
-        return self.tokens[self.cur_token_idx]
-
     def _advance(self):
-        if self.cur_token_idx < len(self.tokens) - 1:
+        if self.cur_token_idx < len(self.kinds) - 1:
             self.cur_token_idx += 1
 
     def _expect(self, token_type):
-        token = self._current()
-        if token.kind != token_type:
+        """
+        Consumes a token of kind token_type and returns its text.
+        """
+        if self.kinds[self.cur_token_idx] != token_type:
             self._error(f"Expected {token_type.name}")
+        text = self.texts[self.cur_token_idx]
         self._advance()
-        return token
+        return text
 
     def _error(self, message):
         sys.exit(f"Parse error: {message}")
\ No newline at end of file
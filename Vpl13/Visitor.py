@@ -4,6 +4,31 @@ from Expression import *
 import Asm as AsmModule
 
 
+def _visit_table(visitor):
+    """
+    Returns the visiting methods of 'visitor' indexed by Expression.KIND, so
+    that 'table[e.KIND](e, arg)' is the same as 'e.accept(visitor, arg)'.
+    """
+    return [
+        visitor.visit_var,
+        visitor.visit_bln,
+        visitor.visit_num,
+        visitor.visit_eql,
+        visitor.visit_and,
+        visitor.visit_or,
+        visitor.visit_add,
+        visitor.visit_sub,
+        visitor.visit_mul,
+        visitor.visit_div,
+        visitor.visit_leq,
+        visitor.visit_lth,
+        visitor.visit_neg,
+        visitor.visit_not,
+        visitor.visit_let,
+        visitor.visit_ifThenElse,
+    ]
+
+
 class Visitor(ABC):
     """
     The visitor pattern consists of two abstract classes: the Expression and the
@@ -13,6 +38,9 @@ class Visitor(ABC):
     specific method for each subclass of Expression. Each instance of such a
     subclasse will invoke the right visiting method.
     """
+    def __init__(self):
+        self._table = _visit_table(self)
+
     @abstractmethod
     def visit_var(self, exp, arg):
         pass
@@ -84,6 +112,7 @@ class GenVisitor(Visitor):
     """
 
     def __init__(self):
+        super().__init__()
         self.next_var_counter = 0
 
     def next_var_name(self):
@@ -172,8 +201,8 @@ class GenVisitor(Visitor):
         0
         """
         # TODO: Implement this method.
-        left_var = exp.left.accept(self, prog)
-        right_var = exp.right.accept(self, prog)
+        left_var = self._table[exp.left.KIND](exp.left, prog)
+        right_var = self._table[exp.right.KIND](exp.right, prog)
         diff = self.next_var_name()
         prog.add_inst(AsmModule.Sub(diff, left_var, right_var))
         lt_one = self.next_var_name()
@@ -227,13 +256,13 @@ class GenVisitor(Visitor):
         0
         """
         # Short-circuit AND: if left is false (0) then result = 0, else result = right
-        left_var = exp.left.accept(self, prog)
+        left_var = self._table[exp.left.KIND](exp.left, prog)
         # if left == 0 jump to false block (target to be set later)
         beq = AsmModule.Beq(left_var, "x0")
         prog.add_inst(beq)
 
         # evaluate right (this will be skipped when left == 0)
-        right_var = exp.right.accept(self, prog)
+        right_var = self._table[exp.right.KIND](exp.right, prog)
         dest = self.next_var_name()
         # copy right into dest
         prog.add_inst(AsmModule.Add(dest, right_var, "x0"))
@@ -295,7 +324,7 @@ class GenVisitor(Visitor):
         1
         """
         # Short-circuit OR: if left is true (non-zero) then result = 1, else result = right
-        left_var = exp.left.accept(self, prog)
+        left_var = self._table[exp.left.KIND](exp.left, prog)
         # if left == 0 jump to evaluate right
         beq = AsmModule.Beq(left_var, "x0")
         prog.add_inst(beq)
@@ -311,7 +340,7 @@ class GenVisitor(Visitor):
         # set beq target to start of right evaluation
         beq.set_target(prog.get_number_of_instructions())
 
-        right_var = exp.right.accept(self, prog)
+        right_var = self._table[exp.right.KIND](exp.right, prog)
         prog.add_inst(AsmModule.Add(dest, right_var, "x0"))
 
         # set jump target to after right block
@@ -336,8 +365,8 @@ class GenVisitor(Visitor):
         >>> p.get_val(v)
         23
         """
-        left_var = exp.left.accept(self, prog)
-        right_var = exp.right.accept(self, prog)
+        left_var = self._table[exp.left.KIND](exp.left, prog)
+        right_var = self._table[exp.right.KIND](exp.right, prog)
         dest = self.next_var_name()
         prog.add_inst(AsmModule.Add(dest, left_var, right_var))
         return dest
@@ -360,8 +389,8 @@ class GenVisitor(Visitor):
         >>> p.get_val(v)
         3
         """
-        left_var = exp.left.accept(self, prog)
-        right_var = exp.right.accept(self, prog)
+        left_var = self._table[exp.left.KIND](exp.left, prog)
+        right_var = self._table[exp.right.KIND](exp.right, prog)
         dest = self.next_var_name()
         prog.add_inst(AsmModule.Sub(dest, left_var, right_var))
         return dest
@@ -384,8 +413,8 @@ class GenVisitor(Visitor):
         >>> p.get_val(v)
         130
         """
-        left_var = exp.left.accept(self, prog)
-        right_var = exp.right.accept(self, prog)
+        left_var = self._table[exp.left.KIND](exp.left, prog)
+        right_var = self._table[exp.right.KIND](exp.right, prog)
         dest = self.next_var_name()
         prog.add_inst(AsmModule.Mul(dest, left_var, right_var))
         return dest
@@ -408,8 +437,8 @@ class GenVisitor(Visitor):
         >>> p.get_val(v)
         1
         """
-        left_var = exp.left.accept(self, prog)
-        right_var = exp.right.accept(self, prog)
+        left_var = self._table[exp.left.KIND](exp.left, prog)
+        right_var = self._table[exp.right.KIND](exp.right, prog)
         dest = self.next_var_name()
         prog.add_inst(AsmModule.Div(dest, left_var, right_var))
         return dest
@@ -464,8 +493,8 @@ class GenVisitor(Visitor):
         >>> p.get_val(v)
         0
         """
-        left_var = exp.left.accept(self, prog)
-        right_var = exp.right.accept(self, prog)
+        left_var = self._table[exp.left.KIND](exp.left, prog)
+        right_var = self._table[exp.right.KIND](exp.right, prog)
         lower_than = self.next_var_name()
         prog.add_inst(AsmModule.Slt(lower_than, right_var, left_var))
         dest = self.next_var_name()
@@ -498,8 +527,8 @@ class GenVisitor(Visitor):
         >>> p.get_val(v)
         1
         """
-        left_var = exp.left.accept(self, prog)
-        right_var = exp.right.accept(self, prog)
+        left_var = self._table[exp.left.KIND](exp.left, prog)
+        right_var = self._table[exp.right.KIND](exp.right, prog)
         dest = self.next_var_name()
         prog.add_inst(AsmModule.Slt(dest, left_var, right_var))
         return dest
@@ -530,7 +559,7 @@ class GenVisitor(Visitor):
         >>> p.get_val(v)
         3
         """
-        operand = exp.exp.accept(self, prog)
+        operand = self._table[exp.exp.KIND](exp.exp, prog)
         dest = self.next_var_name()
         prog.add_inst(AsmModule.Sub(dest, "x0", operand))
         return dest
@@ -577,7 +606,7 @@ class GenVisitor(Visitor):
         >>> p.get_val(v)
         0
         """
-        operand = exp.exp.accept(self, prog)
+        operand = self._table[exp.exp.KIND](exp.exp, prog)
         lt_one = self.next_var_name()
         prog.add_inst(AsmModule.Slti(lt_one, operand, 1))
         lt_zero = self.next_var_name()
@@ -614,9 +643,9 @@ class GenVisitor(Visitor):
             >>> p.get_val(v)
             50
         """
-        value_var = exp.exp_def.accept(self, prog)
+        value_var = self._table[exp.exp_def.KIND](exp.exp_def, prog)
         prog.add_inst(AsmModule.Add(exp.identifier, value_var, "x0"))
-        return exp.exp_body.accept(self, prog)
+        return self._table[exp.exp_body.KIND](exp.exp_body, prog)
 
     def visit_ifThenElse(self, exp, prog):
         """
@@ -671,11 +700,11 @@ class GenVisitor(Visitor):
         >>> p.get_val(v)
         3
         """
-        cond_var = exp.cond.accept(self, prog)
+        cond_var = self._table[exp.cond.KIND](exp.cond, prog)
         beq = AsmModule.Beq(cond_var, "x0")
         prog.add_inst(beq)
 
-        then_var = exp.e0.accept(self, prog)
+        then_var = self._table[exp.e0.KIND](exp.e0, prog)
         dest = self.next_var_name()
         prog.add_inst(AsmModule.Add(dest, then_var, "x0"))
 
@@ -684,7 +713,7 @@ class GenVisitor(Visitor):
 
         beq.set_target(prog.get_number_of_instructions())
 
-        else_var = exp.e1.accept(self, prog)
+        else_var = self._table[exp.e1.KIND](exp.e1, prog)
         prog.add_inst(AsmModule.Add(dest, else_var, "x0"))
 
         jmp.set_target(prog.get_number_of_instructions())
@@ -727,6 +756,7 @@ class RenameVisitor(ABC):
     """
 
     def __init__(self):
+        self._table = _visit_table(self)
         self._counter = 0
 
     def rename(self, base):
@@ -746,8 +776,8 @@ class RenameVisitor(ABC):
         return None
 
     def visit_eql(self, exp, name_map):
-        exp.left.accept(self, name_map)
-        exp.right.accept(self, name_map)
+        self._table[exp.left.KIND](exp.left, name_map)
+        self._table[exp.right.KIND](exp.right, name_map)
 
     def visit_and(self, exp, name_map):
         """
@@ -774,8 +804,8 @@ class RenameVisitor(ABC):
             >>> y0.identifier == x1.identifier
             False
         """
-        exp.left.accept(self, name_map)
-        exp.right.accept(self, name_map)
+        self._table[exp.left.KIND](exp.left, name_map)
+        self._table[exp.right.KIND](exp.right, name_map)
 
     def visit_or(self, exp, name_map):
         """
@@ -802,38 +832,38 @@ class RenameVisitor(ABC):
             >>> y0.identifier == x1.identifier
             False
         """
-        exp.left.accept(self, name_map)
-        exp.right.accept(self, name_map)
+        self._table[exp.left.KIND](exp.left, name_map)
+        self._table[exp.right.KIND](exp.right, name_map)
 
     def visit_add(self, exp, name_map):
-        exp.left.accept(self, name_map)
-        exp.right.accept(self, name_map)
+        self._table[exp.left.KIND](exp.left, name_map)
+        self._table[exp.right.KIND](exp.right, name_map)
 
     def visit_sub(self, exp, name_map):
-        exp.left.accept(self, name_map)
-        exp.right.accept(self, name_map)
+        self._table[exp.left.KIND](exp.left, name_map)
+        self._table[exp.right.KIND](exp.right, name_map)
 
     def visit_mul(self, exp, name_map):
-        exp.left.accept(self, name_map)
-        exp.right.accept(self, name_map)
+        self._table[exp.left.KIND](exp.left, name_map)
+        self._table[exp.right.KIND](exp.right, name_map)
 
     def visit_div(self, exp, name_map):
-        exp.left.accept(self, name_map)
-        exp.right.accept(self, name_map)
+        self._table[exp.left.KIND](exp.left, name_map)
+        self._table[exp.right.KIND](exp.right, name_map)
 
     def visit_leq(self, exp, name_map):
-        exp.left.accept(self, name_map)
-        exp.right.accept(self, name_map)
+        self._table[exp.left.KIND](exp.left, name_map)
+        self._table[exp.right.KIND](exp.right, name_map)
 
     def visit_lth(self, exp, name_map):
-        exp.left.accept(self, name_map)
-        exp.right.accept(self, name_map)
+        self._table[exp.left.KIND](exp.left, name_map)
+        self._table[exp.right.KIND](exp.right, name_map)
 
     def visit_neg(self, exp, name_map):
-        exp.exp.accept(self, name_map)
+        self._table[exp.exp.KIND](exp.exp, name_map)
 
     def visit_not(self, exp, name_map):
-        exp.exp.accept(self, name_map)
+        self._table[exp.exp.KIND](exp.exp, name_map)
 
     def visit_ifThenElse(self, exp, name_map):
         """
@@ -857,15 +887,15 @@ class RenameVisitor(ABC):
             >>> e2.identifier != x1.identifier == e1.identifier
             True
         """
-        exp.cond.accept(self, name_map)
-        exp.e0.accept(self, name_map)
-        exp.e1.accept(self, name_map)
+        self._table[exp.cond.KIND](exp.cond, name_map)
+        self._table[exp.e0.KIND](exp.e0, name_map)
+        self._table[exp.e1.KIND](exp.e1, name_map)
 
     def visit_let(self, exp, name_map):
-        exp.exp_def.accept(self, name_map)
+        self._table[exp.exp_def.KIND](exp.exp_def, name_map)
         originalId = exp.identifier
         newId = self.rename(originalId)
         exp.identifier = newId
         extended_map = dict(name_map)
         extended_map[originalId] = newId
-        exp.exp_body.accept(self, extended_map)
\ No newline at end of file
+        self._table[exp.exp_body.KIND](exp.exp_body, extended_map)
\ No newline at end of file
@@ -22,11 +22,19 @@ values. The following instructions are recognized:
 This file uses doctests all over. To test it, just run python 3 as follows:
 "python3 -m doctest Asm.py". The program uses syntax that is excluive of
 Python 3. It will not work with standard Python 2.
+
+The constructors of the instructions check their arguments with asserts.
+Running python 3 with the -O flag removes these checks, which makes building
+large programs faster.
 """
 
 import sys
 from collections import deque
-from abc import ABC, abstractmethod
+from operator import length_hint
+
+
+# Marks a name that has no value in the environment.
+_UNBOUND = object()
 
 
 class Program:
@@ -83,14 +91,15 @@ class Program:
         >>> p.get_val("x0")
         0
         """
-        if name in self.__env:
-            return self.__env[name]
-        else:
+        val = self.__env.get(name, _UNBOUND)
+        if val is _UNBOUND:
             sys.exit(f"Undefined register: {name}")
+        return val
 
     def print_env(self):
-        for name, val in sorted(self.__env.items()):
-            print(f"{name}: {val}")
+        # The listing is written at once, rather than with a print per name.
+        env = self.__env
+        sys.stdout.write("".join(f"{name}: {env[name]}\n" for name in sorted(env)))
 
     def print_insts(self):
         counter = 0
@@ -127,11 +136,109 @@ class Program:
              sp: 0
              x0: 0
         """
-        inst = self.get_inst()
-        while inst:
-            inst.eval(self)
-            inst = self.get_inst()
-
+        # Each instruction is encoded as a tuple (handler, a, b, c), where the
+        # handler is one of the functions above, which runs the instruction
+        # and returns the next pc. Registers are replaced by indices into the
+        # list 'regs', which holds their values during the run, and which is
+        # written back to the environment at the end. Encoding happens here,
+        # and not in 'add_inst', because branch targets may be set after the
+        # branch is added to the program.
+        names = _Names()
+        insts = self.__insts
+        code = [inst.encode(names) for inst in insts]
+        # Programs that run more than once (see '_compiled') run as Python
+        # functions, and the others through the handlers.
+        run = _compiled(code, len(names))
+        if run is None:
+            _fuse(code, {inst.lab for inst in insts if isinstance(inst, (Beq, Jal))})
+        env = self.__env
+        regs = [env.get(name) for name in names]
+        regs.append(None)  # Written by instructions whose destination is x0.
+        mem = self.__mem
+        n = len(code)
+        pc = self.pc
+        try:
+            if run is None:
+                while 0 <= pc < n:
+                    handler, a, b, c = code[pc]
+                    pc += 1
+                    pc = handler(regs, mem, pc, a, b, c)
+            else:
+                while 0 <= pc < n:
+                    pc = run(regs, mem, pc)
+                    # 'run' stops at addresses where no block starts, which
+                    # only a jalr reaches. Such instructions run one by one.
+                    if 0 <= pc < n:
+                        handler, a, b, c = code[pc]
+                        pc += 1
+                        pc = handler(regs, mem, pc, a, b, c)
+        except BaseException as exc:
+            # A block, or a compiled program, that fails records the address
+            # that follows the instruction that failed (see '_block').
+            pc = exc.__dict__.pop("_asm_pc", pc)
+            if isinstance(exc, TypeError) and type(pc) is int:
+                # Either a register is undefined, or a value cannot take part
+                # in the operation. Running the instruction again through
+                # 'eval' reports each case exactly as 'get_val' and Python
+                # would.
+                self.__write_back(names, regs)
+                self.pc = pc
+                insts[pc - 1].eval(self)
+            raise
+        finally:
+            self.__write_back(names, regs)
+            self.pc = pc
+
+    def compile_to_python(self):
+        """
+        Translates the program into a Python function, which 'eval' runs from
+        then on instead of interpreting the instructions, and returns the
+        source code of that function. Each basic block becomes a branch of an
+        if-statement, and registers become local variables. Programs that use
+        instructions without a translation are not compiled, and this method
+        returns None for them.
+
+        Example:
+            >>> insts = [Addi("a", "x0", 3), Beq("a", "x0", 0), Add("b", "a", "a")]
+            >>> p = Program(0, {}, insts)
+            >>> print(p.compile_to_python())
+            def _run(regs, mem, pc):
+                r0, r1, r2, _ = regs
+                try:
+                    if pc.__class__ is not int:
+                        return pc
+                    while True:
+                        if pc == 0:
+                            r0 = 3
+                            if r0 is None or r1 is None: _undefined()
+                            pc = 0 if r0 == r1 else 2
+                        elif pc == 2:
+                            r2 = r0 + r0
+                            pc = 3
+                        else:
+                            return pc
+                except BaseException as exc:
+                    exc._asm_pc = pcs.get(exc.__traceback__.tb_lineno, pc)
+                    raise
+                finally:
+                    regs[:3] = [r0, r1, r2]
+            >>> p.eval()
+            >>> p.get_val("b")
+            6
+        """
+        names = _Names()
+        code = [inst.encode(names) for inst in self.__insts]
+        translation = _translate(code, len(names))
+        if translation is not None:
+            _remember(tuple(code), _build(*translation))
+            return translation[0]
+
+    def __write_back(self, names, regs):
+        env = self.__env
+        for name, idx in names.items():
+            val = regs[idx]
+            if val is not None:
+                env[name] = val
 
 def max(a, b):
     """
@@ -186,23 +293,371 @@ def distance_with_acceleration(V, A, T):
     return p.get_val("rd")
 
 
-class Inst(ABC):
+class _Names(dict):
+    """
+    Maps register names to their indices in the list of values that
+    'Program.eval' runs on. Looking up a name that is not there yet gives it
+    the next index.
+    """
+
+    __slots__ = ()
+
+    def __missing__(self, name):
+        idx = self[name] = len(self)
+        return idx
+
+    def dest(self, name):
+        """
+        Returns the index that an instruction writing on 'name' stores into.
+        Writes on x0 go to the extra slot at the end of the list (index -1),
+        which is never read, so x0 keeps its zero.
+        """
+        return -1 if name == "x0" else self[name]
+
+
+# The handlers of the encoded instructions (see 'Inst.encode'). Each one takes
+# the list of register values, the memory, the address of the next instruction
+# and the operands of the instruction, and returns the address of the
+# instruction that must run next. An undefined register holds None, and
+# reading it raises TypeError, which 'Program.eval' turns into the error of
+# 'get_val'.
+
+def _undefined():
+    raise TypeError("undefined register")
+
+
+def _beq(regs, mem, pc, rs1, rs2, lab):
+    a = regs[rs1]
+    b = regs[rs2]
+    if a is None or b is None:
+        _undefined()
+    return lab if a == b else pc
+
+
+def _beq_same(regs, mem, pc, rs, _, lab):
+    if regs[rs] is None:
+        _undefined()
+    return lab
+
+
+def _jal(regs, mem, pc, rd, lab, _):
+    regs[rd] = pc
+    return lab
+
+
+def _j(regs, mem, pc, lab, _, __):
+    return lab
+
+
+def _jalr(regs, mem, pc, rd, rs, offset):
+    regs[rd] = pc
+    return regs[rs] + offset
+
+
+def _sw(regs, mem, pc, rs1, offset, reg):
+    val = regs[reg]
+    if val is None:
+        _undefined()
+    mem[regs[rs1] + offset] = val
+    return pc
+
+
+def _lw(regs, mem, pc, rs1, offset, reg):
+    regs[reg] = mem[regs[rs1] + offset]
+    return pc
+
+
+def _add(regs, mem, pc, rd, rs1, rs2):
+    regs[rd] = regs[rs1] + regs[rs2]
+    return pc
+
+
+def _addi(regs, mem, pc, rd, rs1, imm):
+    regs[rd] = regs[rs1] + imm
+    return pc
+
+
+def _li(regs, mem, pc, rd, imm, _):
+    regs[rd] = imm
+    return pc
+
+
+def _mul(regs, mem, pc, rd, rs1, rs2):
+    regs[rd] = regs[rs1] * regs[rs2]
+    return pc
+
+
+def _sub(regs, mem, pc, rd, rs1, rs2):
+    regs[rd] = regs[rs1] - regs[rs2]
+    return pc
+
+
+def _xor(regs, mem, pc, rd, rs1, rs2):
+    regs[rd] = regs[rs1] ^ regs[rs2]
+    return pc
+
+
+def _xori(regs, mem, pc, rd, rs1, imm):
+    regs[rd] = regs[rs1] ^ imm
+    return pc
+
+
+def _div(regs, mem, pc, rd, rs1, rs2):
+    regs[rd] = regs[rs1] // regs[rs2]
+    return pc
+
+
+def _slt(regs, mem, pc, rd, rs1, rs2):
+    regs[rd] = 1 if regs[rs1] < regs[rs2] else 0
+    return pc
+
+
+def _slti(regs, mem, pc, rd, rs1, imm):
+    regs[rd] = 1 if regs[rs1] < imm else 0
+    return pc
+
+
+def _block(regs, mem, pc, ops, end, _):
+    it = iter(ops)
+    try:
+        for handler, a, b, c in it:
+            handler(regs, mem, pc, a, b, c)
+    except BaseException as exc:
+        # The instruction that failed is the last one taken from 'it'.
+        exc._asm_pc = end - length_hint(it)
+        raise
+    return end
+
+
+# The handlers of the instructions that always fall through to the next one.
+_STRAIGHT = frozenset((_sw, _lw, _add, _addi, _li, _mul, _sub, _xor, _xori,
+                       _div, _slt, _slti))
+
+
+def _fuse(code, targets):
+    """
+    Replaces the first instruction of each run of two or more straight-line
+    instructions in 'code' with a block, which runs the whole run in a single
+    dispatch. Runs are split at the addresses in 'targets', so that branches
+    land at the start of a block. The other instructions of a run keep their
+    own entries, so a jump into the middle of a run (through jalr, say) still
+    works: it runs them one at a time until the end of the run.
+
+    Example:
+        >>> code = [(_li, 0, 1, None), (_add, 1, 0, 0), (_j, 0, None, None)]
+        >>> _fuse(code, set())
+        >>> code[0][0] is _block, code[0][2], len(code[0][1])
+        (True, 2, 2)
+        >>> code[1][0] is _add
+        True
+    """
+    n = len(code)
+    start = 0
+    while start < n:
+        end = start
+        while end < n and code[end][0] in _STRAIGHT and \
+                (end == start or end not in targets):
+            end += 1
+        if end - start >= 2:
+            code[start] = (_block, tuple(code[start:end]), end, None)
+        start = end if end > start else start + 1
+
+
+# Python code for the handlers that 'compile_to_python' translates. The
+# fields {a}, {b} and {c} stand for the operands of the instruction, {next} for
+# the address that follows it, and registers are written as {ra}, {rb}, {rc}.
+# Each template does what its handler does, in the same order.
+_TEMPLATES = {
+    _add: ("{ra} = {rb} + {rc}",),
+    _addi: ("{ra} = {rb} + {c}",),
+    _li: ("{ra} = {b}",),
+    _mul: ("{ra} = {rb} * {rc}",),
+    _sub: ("{ra} = {rb} - {rc}",),
+    _xor: ("{ra} = {rb} ^ {rc}",),
+    _xori: ("{ra} = {rb} ^ {c}",),
+    _div: ("{ra} = {rb} // {rc}",),
+    _slt: ("{ra} = 1 if {rb} < {rc} else 0",),
+    _slti: ("{ra} = 1 if {rb} < {c} else 0",),
+    _sw: ("if {rc} is None: _undefined()", "mem[{ra} + {b}] = {rc}"),
+    _lw: ("{rc} = mem[{ra} + {b}]",),
+    _beq: ("if {ra} is None or {rb} is None: _undefined()",
+           "pc = {c} if {ra} == {rb} else {next}"),
+    _beq_same: ("if {ra} is None: _undefined()", "pc = {c}"),
+    _jal: ("{ra} = {next}", "pc = {b}"),
+    _j: ("pc = {a}",),
+    _jalr: ("{ra} = {next}", "pc = {rb} + {c}",
+            "if pc.__class__ is not int: return pc"),
+}
+
+# The operands of each handler that the templates write as literals.
+_LITERALS = {
+    handler: tuple(i for i, field in enumerate("abc", 1)
+                   if any("{%s}" % field in t for t in templates))
+    for handler, templates in _TEMPLATES.items()
+}
+
+# The handlers that end a basic block, and the operand that holds the target
+# of those whose target is known before the program runs.
+_JUMPS = {_beq: 3, _beq_same: 3, _jal: 2, _j: 1, _jalr: None}
+
+
+def _reg(idx):
+    return "_" if idx == -1 else f"r{idx}"
+
+
+def _translate(code, num_regs):
+    """
+    Translates encoded instructions into the source code of a function
+    '_run(regs, mem, pc)', which runs the program from pc until it reaches an
+    address where no basic block starts, and returns that address. Returns
+    the source code, plus a map from its lines to the address that follows
+    the instruction on each line, or None if some instruction has no
+    translation.
+    """
+    n = len(code)
+    starts = {0}
+    for i, inst in enumerate(code):
+        handler = inst[0]
+        if handler not in _TEMPLATES:
+            return None
+        # Immediates and labels are written into the source as they are.
+        if any(type(inst[i]) is not int for i in _LITERALS[handler]):
+            return None
+        if handler in _JUMPS:
+            starts.add(i + 1)
+            target = _JUMPS[handler]
+            if target is not None:
+                starts.add(inst[target])
+    starts = sorted(x for x in starts if 0 <= x < n)
+    lines = [
+        "def _run(regs, mem, pc):",
+        "    %s_ = regs" % "".join(_reg(i) + ", " for i in range(num_regs)),
+        "    try:",
+        "        if pc.__class__ is not int:",
+        "            return pc",
+        "        while True:",
+    ]
+    pcs = {}
+
+    def emit_block(start, indent):
+        i = start
+        while True:
+            handler, a, b, c = code[i]
+            fields = {"a": a, "b": b, "c": c, "next": i + 1,
+                      "ra": _reg(a), "rb": _reg(b), "rc": _reg(c)}
+            for template in _TEMPLATES[handler]:
+                lines.append(indent + template.format(**fields))
+                pcs[len(lines)] = i + 1
+            i += 1
+            if handler in _JUMPS:
+                return
+            if i == n or i in block_starts:
+                lines.append(indent + f"pc = {i}")
+                return
+
+    def emit_dispatch(lo, hi, indent):
+        # Selects the block that starts at pc among starts[lo:hi] with a
+        # binary search, so that a jump costs a few comparisons.
+        if hi - lo > 4:
+            mid = (lo + hi) // 2
+            lines.append(indent + f"if pc < {starts[mid]}:")
+            emit_dispatch(lo, mid, indent + "    ")
+            lines.append(indent + "else:")
+            emit_dispatch(mid, hi, indent + "    ")
+            return
+        keyword = "if"
+        for start in starts[lo:hi]:
+            lines.append(indent + f"{keyword} pc == {start}:")
+            emit_block(start, indent + "    ")
+            keyword = "elif"
+        lines.append(indent + "else:")
+        lines.append(indent + "    return pc")
+
+    block_starts = set(starts)
+    emit_dispatch(0, len(starts), " " * 12)
+    lines += [
+        "    except BaseException as exc:",
+        "        exc._asm_pc = pcs.get(exc.__traceback__.tb_lineno, pc)",
+        "        raise",
+        "    finally:",
+        "        regs[:%d] = [%s]" % (num_regs, ", ".join(
+            _reg(i) for i in range(num_regs))),
+    ]
+    return "\n".join(lines), pcs
+
+
+def _build(source, pcs):
+    namespace = {"_undefined": _undefined, "pcs": pcs}
+    exec(compile(source, "<asm>", "exec"), namespace)
+    return namespace["_run"]
+
+
+# Compiled programs, keyed by their encoded instructions. A program is
+# compiled the second time that it runs, or when 'compile_to_python' is
+# called: compiling costs about as much as interpreting a few thousand
+# instructions, which most programs never run. The value None marks programs
+# that ran only once, and False programs that cannot be compiled.
+_COMPILED = {}
+_MAX_COMPILED = 256
+
+
+def _compiled(code, num_regs):
+    """
+    Returns the function that runs 'code', or None if 'code' must be
+    interpreted.
+    """
+    if not code:
+        return None
+    key = tuple(code)
+    run = _COMPILED.get(key)
+    if run is None:
+        if key not in _COMPILED:
+            _remember(key, None)
+            return None
+        translation = _translate(code, num_regs)
+        if translation is None:
+            run = False
+        else:
+            run = _build(*translation)
+        _remember(key, run)
+    return run or None
+
+
+def _remember(key, run):
+    """
+    Records 'run' for 'key' in _COMPILED, emptying the cache first when it
+    is full and 'key' is new.
+    """
+    if key not in _COMPILED and len(_COMPILED) >= _MAX_COMPILED:
+        _COMPILED.clear()
+    _COMPILED[key] = run
+
+
+class Inst:
     """
     The representation of instructions. Every instruction refers to a program
     during its evaluation.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         pass
 
-    @abstractmethod
     def get_opcode(self):
-        raise NotImplementedError
+        return self.opcode
 
-    @abstractmethod
     def eval(self, prog):
         raise NotImplementedError
 
+    def encode(self, names):
+        """
+        Returns the instruction as a tuple (handler, a, b, c), which is the
+        form in which 'Program.eval' runs it. Registers are replaced by their
+        indices in 'names', a '_Names' mapping.
+        """
+        raise NotImplementedError
+
 
 class BranchOp(Inst):
     """
@@ -211,6 +666,8 @@ class BranchOp(Inst):
     pc + 1. A branch might change pc to point out to a different label..
     """
 
+    __slots__ = ('lab',)
+
     def set_target(self, lab):
         assert isinstance(lab, int)
         self.lab = lab
@@ -222,20 +679,27 @@ class Beq(BranchOp):
     Jumps to label lab if the value in rs1 is equal to the value in rs2.
     """
 
+    __slots__ = ('rs1', 'rs2')
+    opcode = "beq"
+
     def __init__(self, rs1, rs2, lab=None):
         assert isinstance(rs1, str) and isinstance(rs2, str)
         self.rs1 = rs1
         self.rs2 = rs2
-        if lab != None:
-            assert isinstance(lab, int)
+        assert lab is None or isinstance(lab, int)
         self.lab = lab
 
-    def get_opcode(self):
-        return "beq"
+    def encode(self, names):
+        # Comparing a register with itself always jumps, once the register is
+        # known to be defined, and x0 is always defined.
+        if self.rs1 == self.rs2:
+            if self.rs1 == "x0":
+                return (_j, self.lab, None, None)
+            return (_beq_same, names[self.rs1], None, self.lab)
+        return (_beq, names[self.rs1], names[self.rs2], self.lab)
 
     def __str__(self):
-        op = self.get_opcode()
-        return f"{op} {self.rs1} {self.rs2} {self.lab}"
+        return f"{self.opcode} {self.rs1} {self.rs2} {self.lab}"
 
     def eval(self, prog):
         if prog.get_val(self.rs1) == prog.get_val(self.rs2):
@@ -265,19 +729,22 @@ class Jal(BranchOp):
         (20, 0)
     """
 
+    __slots__ = ('rd',)
+    opcode = "jal"
+
     def __init__(self, rd, lab=None):
         assert isinstance(rd, str)
         self.rd = rd
-        if lab != None:
-            assert isinstance(lab, int)
+        assert lab is None or isinstance(lab, int)
         self.lab = lab
 
-    def get_opcode(self):
-        return "jal"
+    def encode(self, names):
+        if self.rd == "x0":
+            return (_j, self.lab, None, None)
+        return (_jal, names.dest(self.rd), self.lab, None)
 
     def __str__(self):
-        op = self.get_opcode()
-        return f"{op} {self.rd} {self.lab}"
+        return f"{self.opcode} {self.rd} {self.lab}"
 
     def eval(self, prog):
         if self.rd != "x0":
@@ -311,20 +778,21 @@ class Jalr(BranchOp):
         (50, 0)
     """
 
+    __slots__ = ('rd', 'rs', 'offset')
+    opcode = "jalr"
+
     def __init__(self, rd, rs, offset=0):
         assert isinstance(rd, str) and isinstance(rs, str)
         self.rd = rd
         self.rs = rs
-        if offset != None:
-            assert isinstance(offset, int)
+        assert offset is None or isinstance(offset, int)
         self.offset = offset
 
-    def get_opcode(self):
-        return "jalr"
+    def encode(self, names):
+        return (_jalr, names.dest(self.rd), names[self.rs], self.offset)
 
     def __str__(self):
-        op = self.get_opcode()
-        return f"{op} {self.rd} {self.rs} {self.offset}"
+        return f"{self.opcode} {self.rd} {self.rs} {self.offset}"
 
     def eval(self, prog):
         if self.rd != "x0":
@@ -339,6 +807,8 @@ class MemOp(Inst):
     include loads and stores.
     """
 
+    __slots__ = ('rs1', 'offset', 'reg')
+
     def __init__(self, rs1, offset, reg):
         assert isinstance(rs1, str) and isinstance(reg, str) and isinstance(offset, int)
         self.rs1 = rs1
@@ -346,8 +816,7 @@ class MemOp(Inst):
         self.reg = reg
 
     def __str__(self):
-        op = self.get_opcode()
-        return f"{op} {self.reg}, {self.offset}({self.rs1})"
+        return f"{self.opcode} {self.reg}, {self.offset}({self.rs1})"
 
 
 class Sw(MemOp):
@@ -371,13 +840,16 @@ class Sw(MemOp):
         2
     """
 
+    __slots__ = ()
+    opcode = "sw"
+
     def eval(self, prog):
         val = prog.get_val(self.reg)
         addr = prog.get_val(self.rs1) + self.offset
         prog.set_mem(addr, val)
 
-    def get_opcode(self):
-        return "sw"
+    def encode(self, names):
+        return (_sw, names[self.rs1], self.offset, names[self.reg])
 
 
 class Lw(MemOp):
@@ -407,13 +879,16 @@ class Lw(MemOp):
         5
     """
 
+    __slots__ = ()
+    opcode = "lw"
+
     def eval(self, prog):
         addr = prog.get_val(self.rs1) + self.offset
         val = prog.get_mem(addr)
         prog.set_val(self.reg, val)
 
-    def get_opcode(self):
-        return "lw"
+    def encode(self, names):
+        return (_lw, names[self.rs1], self.offset, names.dest(self.reg))
 
 
 class BinOp(Inst):
@@ -422,6 +897,8 @@ class BinOp(Inst):
     value, and use two values.
     """
 
+    __slots__ = ('rd', 'rs1', 'rs2')
+
     def __init__(self, rd, rs1, rs2):
         assert isinstance(rd, str) and isinstance(rs1, str) and isinstance(rs2, str)
         self.rd = rd
@@ -429,8 +906,7 @@ class BinOp(Inst):
         self.rs2 = rs2
 
     def __str__(self):
-        op = self.get_opcode()
-        return f"{self.rd} = {op} {self.rs1} {self.rs2}"
+        return f"{self.rd} = {self.opcode} {self.rs1} {self.rs2}"
 
 
 class BinOpImm(Inst):
@@ -440,6 +916,8 @@ class BinOpImm(Inst):
     and one immediate constant.
     """
 
+    __slots__ = ('rd', 'rs1', 'imm')
+
     def __init__(self, rd, rs1, imm):
         assert isinstance(rd, str) and isinstance(rs1, str) and isinstance(imm, int)
         self.rd = rd
@@ -447,8 +925,7 @@ class BinOpImm(Inst):
         self.imm = imm
 
     def __str__(self):
-        op = self.get_opcode()
-        return f"{self.rd} = {op} {self.rs1} {self.imm}"
+        return f"{self.rd} = {self.opcode} {self.rs1} {self.imm}"
 
 
 class Add(BinOp):
@@ -466,13 +943,16 @@ class Add(BinOp):
         5
     """
 
+    __slots__ = ()
+    opcode = "add"
+
     def eval(self, prog):
         rs1 = prog.get_val(self.rs1)
         rs2 = prog.get_val(self.rs2)
         prog.set_val(self.rd, rs1 + rs2)
 
-    def get_opcode(self):
-        return "add"
+    def encode(self, names):
+        return (_add, names.dest(self.rd), names[self.rs1], names[self.rs2])
 
 
 class Addi(BinOpImm):
@@ -488,14 +968,26 @@ class Addi(BinOpImm):
         >>> p.eval()
         >>> p.get_val("a")
         5
+
+        >>> p = Program(0, env={}, insts=[Addi("a", "x0", True)])
+        >>> p.eval()
+        >>> p.get_val("a")
+        1
     """
 
+    __slots__ = ()
+    opcode = "addi"
+
     def eval(self, prog):
         rs1 = prog.get_val(self.rs1)
         prog.set_val(self.rd, rs1 + self.imm)
 
-    def get_opcode(self):
-        return "addi"
+    def encode(self, names):
+        if self.rs1 == "x0":
+            # 'addi rd, x0, imm' is how constants are loaded. The sum with
+            # x0 is kept, so that a bool immediate still loads an int.
+            return (_li, names.dest(self.rd), 0 + self.imm, None)
+        return (_addi, names.dest(self.rd), names[self.rs1], self.imm)
 
 
 class Mul(BinOp):
@@ -513,13 +1005,16 @@ class Mul(BinOp):
         6
     """
 
+    __slots__ = ()
+    opcode = "mul"
+
     def eval(self, prog):
         rs1 = prog.get_val(self.rs1)
         rs2 = prog.get_val(self.rs2)
         prog.set_val(self.rd, rs1 * rs2)
 
-    def get_opcode(self):
-        return "mul"
+    def encode(self, names):
+        return (_mul, names.dest(self.rd), names[self.rs1], names[self.rs2])
 
 
 class Sub(BinOp):
@@ -537,13 +1032,16 @@ class Sub(BinOp):
         -1
     """
 
+    __slots__ = ()
+    opcode = "sub"
+
     def eval(self, prog):
         rs1 = prog.get_val(self.rs1)
         rs2 = prog.get_val(self.rs2)
         prog.set_val(self.rd, rs1 - rs2)
 
-    def get_opcode(self):
-        return "sub"
+    def encode(self, names):
+        return (_sub, names.dest(self.rd), names[self.rs1], names[self.rs2])
 
 
 class Xor(BinOp):
@@ -561,13 +1059,16 @@ class Xor(BinOp):
         1
     """
 
+    __slots__ = ()
+    opcode = "xor"
+
     def eval(self, prog):
         rs1 = prog.get_val(self.rs1)
         rs2 = prog.get_val(self.rs2)
         prog.set_val(self.rd, rs1 ^ rs2)
 
-    def get_opcode(self):
-        return "xor"
+    def encode(self, names):
+        return (_xor, names.dest(self.rd), names[self.rs1], names[self.rs2])
 
 
 class Xori(BinOpImm):
@@ -585,12 +1086,15 @@ class Xori(BinOpImm):
         1
     """
 
+    __slots__ = ()
+    opcode = "xori"
+
     def eval(self, prog):
         rs1 = prog.get_val(self.rs1)
         prog.set_val(self.rd, rs1 ^ self.imm)
 
-    def get_opcode(self):
-        return "xori"
+    def encode(self, names):
+        return (_xori, names.dest(self.rd), names[self.rs1], self.imm)
 
 
 class Div(BinOp):
@@ -610,13 +1114,16 @@ class Div(BinOp):
         2
     """
 
+    __slots__ = ()
+    opcode = "div"
+
     def eval(self, prog):
         rs1 = prog.get_val(self.rs1)
         rs2 = prog.get_val(self.rs2)
         prog.set_val(self.rd, rs1 // rs2)
 
-    def get_opcode(self):
-        return "div"
+    def encode(self, names):
+        return (_div, names.dest(self.rd), names[self.rs1], names[self.rs2])
 
 
 class Slt(BinOp):
@@ -644,13 +1151,16 @@ class Slt(BinOp):
         0
     """
 
+    __slots__ = ()
+    opcode = "slt"
+
     def eval(self, prog):
         rs1 = prog.get_val(self.rs1)
         rs2 = prog.get_val(self.rs2)
         prog.set_val(self.rd, 1 if rs1 < rs2 else 0)
 
-    def get_opcode(self):
-        return "slt"
+    def encode(self, names):
+        return (_slt, names.dest(self.rd), names[self.rs1], names[self.rs2])
 
 
 class Slti(BinOpImm):
@@ -679,9 +1189,12 @@ class Slti(BinOpImm):
         0
     """
 
+    __slots__ = ()
+    opcode = "slti"
+
     def eval(self, prog):
         rs1 = prog.get_val(self.rs1)
         prog.set_val(self.rd, 1 if rs1 < self.imm else 0)
 
-    def get_opcode(self):
-        return "slti"
\ No newline at end of file
+    def encode(self, names):
+        return (_slti, names.dest(self.rd), names[self.rs1], self.imm)
\ No newline at end of file
@@ -1,4 +1,5 @@
 import sys
+import re
 import enum
 
 
@@ -9,6 +10,8 @@ class Token:
     uniquely. See the TokenType to know the possible identifiers (if you want).
     You don't need to change this class.
     """
+    __slots__ = ("text", "kind")
+
     def __init__(self, tokenText, tokenKind):
         # The token's actual text. Used for identifiers, strings, and numbers.
         self.text = tokenText
@@ -57,6 +60,118 @@ class TokenType(enum.Enum):
     INT = 222  # The int type ('int')
     LGC = 223  # The boolean (logic) type ('bool')
 
+
+# Character classes used by the scanners. Each entry of _TBL, indexed by a
+# byte, is a bit set of the classes that the byte belongs to.
+_DIGIT = 1
+_ALPHA = 2
+_IDCONT = 4
+_BLANK = 8
+
+
+def _char_class(char):
+    """
+    Returns the classes of 'char' as a bit set. _TBL holds this for every
+    ASCII character; the scanners call it only for the others, which 'buf'
+    replaces with '?'.
+
+    >>> _char_class("a") == _ALPHA | _IDCONT, _char_class("\u00e9") == _TBL[ord("a")]
+    (True, True)
+    """
+    cls = 0
+    if char.isdigit():
+        cls |= _DIGIT
+    if char.isalpha():
+        cls |= _ALPHA
+    if char.isalnum() or char == "_":
+        cls |= _IDCONT
+    if char in " \t\r":
+        cls |= _BLANK
+    return cls
+
+
+def _build_char_classes():
+    table = bytearray(256)
+    for code in range(128):
+        table[code] = _char_class(chr(code))
+    return bytes(table)
+
+
+_TBL = _build_char_classes()
+
+
+# A single pattern that recognizes every token of the language, so tokens()
+# runs the whole scan inside the regex engine. The alternatives are tried in
+# order: comments come before '-' and '(', and the two-character operators
+# come before their one-character prefixes. The UNT group catches a '(*' that
+# is never closed, and the ERR group any character that starts no token.
+_TOKEN_RE = re.compile(r"""
+    (?P<NLN>\n)
+  | (?P<WSP>[ \t\r]+)
+  | (?P<COM>--[^\n]*|\(\*.*?\*\))
+  | (?P<UNT>\(\*)
+  | (?P<NUM>[0-9]+)
+  | (?P<VAR>[A-Za-z][A-Za-z0-9_]*)
+  | (?P<TPF>->) | (?P<ARW>=>) | (?P<ASN><-)
+  | (?P<LEQ><=) | (?P<EQL>==?)
+  | (?P<ADD>\+) | (?P<SUB>-) | (?P<MUL>\*)
+  | (?P<DIV>/) | (?P<LTH><) | (?P<NEG>~)
+  | (?P<COL>:) | (?P<LPR>\() | (?P<RPR>\))
+  | (?P<ERR>.)
+""", re.VERBOSE | re.DOTALL)
+
+_KEYWORDS = {
+    "let": TokenType.LET,
+    "in": TokenType.INX,
+    "end": TokenType.END,
+    "true": TokenType.TRU,
+    "false": TokenType.FLS,
+    "if": TokenType.IFX,
+    "then": TokenType.THN,
+    "else": TokenType.ELS,
+    "or": TokenType.ORX,
+    "and": TokenType.AND,
+    "not": TokenType.NOT,
+    "fn": TokenType.FNX,
+    "int": TokenType.INT,
+    "bool": TokenType.LGC,
+}
+
+# Tokens whose text is fixed are built once and shared by every lexer. The
+# parser only reads tokens, so sharing them is safe.
+_EOF_TOK = Token("", TokenType.EOF)
+_NLN_TOK = Token("\n", TokenType.NLN)
+_ADD_TOK = Token("+", TokenType.ADD)
+_TPF_TOK = Token("->", TokenType.TPF)
+_SUB_TOK = Token("-", TokenType.SUB)
+_MUL_TOK = Token("*", TokenType.MUL)
+_DIV_TOK = Token("/", TokenType.DIV)
+_ASN_TOK = Token("<-", TokenType.ASN)
+_LEQ_TOK = Token("<=", TokenType.LEQ)
+_LTH_TOK = Token("<", TokenType.LTH)
+_ARW_TOK = Token("=>", TokenType.ARW)
+_EQQ_TOK = Token("==", TokenType.EQL)
+_EQL_TOK = Token("=", TokenType.EQL)
+_NEG_TOK = Token("~", TokenType.NEG)
+_COL_TOK = Token(":", TokenType.COL)
+_LPR_TOK = Token("(", TokenType.LPR)
+_RPR_TOK = Token(")", TokenType.RPR)
+
+_TOKEN_BY_TEXT = {
+    tok.text: tok
+    for tok in (_ADD_TOK, _TPF_TOK, _SUB_TOK, _MUL_TOK, _DIV_TOK, _ASN_TOK,
+                _LEQ_TOK, _LTH_TOK, _ARW_TOK, _EQQ_TOK, _EQL_TOK, _NEG_TOK,
+                _COL_TOK, _LPR_TOK, _RPR_TOK)
+}
+_TOKEN_BY_TEXT.update(
+    (text, Token(text, kind)) for text, kind in _KEYWORDS.items()
+)
+
+# Groups, and kinds of tokens, that tokens() drops.
+_SKIPPED_GROUPS = frozenset(("NLN", "WSP", "COM"))
+_SKIPPED_KINDS = frozenset((TokenType.NLN, TokenType.WSP, TokenType.COM))
+
+
 class Lexer:
     
     def __init__(self, source):
@@ -67,6 +182,10 @@ class Lexer:
         self.source = source
         self.position = 0
         self.length = len(source)
+        # Non-ASCII characters become '?', which belongs to no class, so the
+        # buffer stays aligned with the source. The scanners classify those
+        # characters with _char_class instead.
+        self.buf = source.encode("ascii", "replace")
 
     def _peek(self):
         if self.position >= self.length:
@@ -121,12 +240,33 @@ class Lexer:
         >>> [tk.kind.name for tk in l.tokens()]
         ['VAR', 'COL', 'INT', 'TPF', 'LGC']
         """
-        token = self.getToken()
-        while token.kind != TokenType.EOF:
-            if token.kind != TokenType.WSP and token.kind != TokenType.COM \
-                    and token.kind != TokenType.NLN:
-                yield token
+        if not self.source.isascii():
+            # _TOKEN_RE only knows ASCII letters and digits.
             token = self.getToken()
+            while token.kind is not TokenType.EOF:
+                if token.kind not in _SKIPPED_KINDS:
+                    yield token
+                token = self.getToken()
+            return
+        token_by_text = _TOKEN_BY_TEXT
+        skipped = _SKIPPED_GROUPS
+        for match in _TOKEN_RE.finditer(self.source):
+            group = match.lastgroup
+            if group in skipped:
+                continue
+            text = match.group()
+            token = token_by_text.get(text)
+            if token is not None:
+                yield token
+            elif group == "NUM":
+                yield Token(text, TokenType.NUM)
+            elif group == "VAR":
+                yield Token(text, TokenType.VAR)
+            elif group == "UNT":
+                raise ValueError("Unterminated block comment")
+            else:
+                raise ValueError(f"Unexpected character: {text}")
+        self.position = self.length
 
     def getToken(self):
         """
@@ -135,102 +275,94 @@ class Lexer:
         """
         while True:
             if self.position >= self.length:
-                return Token("", TokenType.EOF)
+                return _EOF_TOK
 
             current_char = self._peek()
+            cls = _TBL[self.buf[self.position]]
+            if not cls and current_char > "\x7f":
+                cls = _char_class(current_char)
 
             if current_char == "\n":
                 self._advance()
-                return Token("\n", TokenType.NLN)
+                return _NLN_TOK
 
-            if current_char in " \t\r":
+            if cls & _BLANK:
                 self._advance()
                 return Token(current_char, TokenType.WSP)
 
             if current_char == "-" and self._peek_next() == "-":
                 start = self.position
-                self.position += 2
-                while self.position < self.length and self.source[self.position] != "\n":
-                    self.position += 1
-                text = self.source[start:self.position]
-                return Token(text, TokenType.COM)
+                end = self.source.find("\n", start + 2)
+                if end < 0:
+                    end = self.length
+                self.position = end
+                return Token(self.source[start:end], TokenType.COM)
 
             if current_char == "(" and self._peek_next() == "*":
                 start = self.position
-                self.position += 2
-                while self.position < self.length - 1:
-                    if self.source[self.position] == "*" and self.source[self.position + 1] == ")":
-                        self.position += 2
-                        text = self.source[start:self.position]
-                        return Token(text, TokenType.COM)
-                    self.position += 1
-                raise ValueError("Unterminated block comment")
-
-            if current_char.isdigit():
-                start = self.position
-                while self.position < self.length and self.source[self.position].isdigit():
-                    self.position += 1
-                text = self.source[start:self.position]
-                return Token(text, TokenType.NUM)
+                end = self.source.find("*)", start + 2)
+                if end < 0:
+                    raise ValueError("Unterminated block comment")
+                self.position = end + 2
+                return Token(self.source[start:end + 2], TokenType.COM)
 
-            if current_char.isalpha():
+            if cls & (_DIGIT | _ALPHA):
+                source = self.source
+                buf = self.buf
+                n = self.length
                 start = self.position
-                while self.position < self.length and (self.source[self.position].isalnum() or self.source[self.position] == "_"):
-                    self.position += 1
-                text = self.source[start:self.position]
-                keywords = {
-                    "let": TokenType.LET,
-                    "in": TokenType.INX,
-                    "end": TokenType.END,
-                    "true": TokenType.TRU,
-                    "false": TokenType.FLS,
-                    "if": TokenType.IFX,
-                    "then": TokenType.THN,
-                    "else": TokenType.ELS,
-                    "or": TokenType.ORX,
-                    "and": TokenType.AND,
-                    "not": TokenType.NOT,
-                    "fn": TokenType.FNX,
-                    "int": TokenType.INT,
-                    "bool": TokenType.LGC,
-                }
-                token_kind = keywords.get(text, TokenType.VAR)
-                return Token(text, token_kind)
+                pos = start + 1
+                mask = _DIGIT if cls & _DIGIT else _IDCONT
+                while pos < n:
+                    if _TBL[buf[pos]] & mask:
+                        pos += 1
+                    elif source[pos] > "\x7f" and _char_class(source[pos]) & mask:
+                        pos += 1
+                    else:
+                        break
+                self.position = pos
+                text = source[start:pos]
+                if mask == _DIGIT:
+                    return Token(text, TokenType.NUM)
+                token = _TOKEN_BY_TEXT.get(text)
+                if token is None:
+                    token = Token(text, TokenType.VAR)
+                return token
 
             current_char = self._advance()
             if current_char == "+":
-                return Token("+", TokenType.ADD)
+                return _ADD_TOK
             if current_char == "-":
                 if self._peek() == ">":
                     self._advance()
-                    return Token("->", TokenType.TPF)
-                return Token("-", TokenType.SUB)
+                    return _TPF_TOK
+                return _SUB_TOK
             if current_char == "*":
-                return Token("*", TokenType.MUL)
+                return _MUL_TOK
             if current_char == "/":
-                return Token("/", TokenType.DIV)
+                return _DIV_TOK
             if current_char == "<":
                 if self._peek() == "-":
                     self._advance()
-                    return Token("<-", TokenType.ASN)
+                    return _ASN_TOK
                 if self._peek() == "=":
                     self._advance()
-                    return Token("<=", TokenType.LEQ)
-                return Token("<", TokenType.LTH)
+                    return _LEQ_TOK
+                return _LTH_TOK
             if current_char == "=":
                 if self._peek() == ">":
                     self._advance()
-                    return Token("=>", TokenType.ARW)
+                    return _ARW_TOK
                 if self._peek() == "=":
                     self._advance()
-                    return Token("==", TokenType.EQL)
-                return Token("=", TokenType.EQL)
+                    return _EQQ_TOK
+                return _EQL_TOK
             if current_char == "~":
-                return Token("~", TokenType.NEG)
+                return _NEG_TOK
             if current_char == ":":
-                return Token(":", TokenType.COL)
+                return _COL_TOK
             if current_char == "(":
-                return Token("(", TokenType.LPR)
+                return _LPR_TOK
             if current_char == ")":
-                return Token(")", TokenType.RPR)
+                return _RPR_TOK
             raise ValueError(f"Unexpected character: {current_char}")
\ No newline at end of file
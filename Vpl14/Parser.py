@@ -3,6 +3,13 @@ import sys
 from Expression import *
 from Lexer import Token, TokenType
 
+# The kinds of token that can start the argument of an application.
+_APPLICATION_START = frozenset((
+    TokenType.NUM, TokenType.TRU, TokenType.FLS, TokenType.VAR, TokenType.LPR,
+    TokenType.LET, TokenType.FNX, TokenType.NEG, TokenType.NOT,
+))
+
+
 class Parser:
     def __init__(self, tokens):
         """
@@ -222,69 +229,111 @@ class Parser:
         return expr
 
     def _parse_expression(self):
-        if self._current().kind == TokenType.IFX:
-            self._advance()
+        tokens = self.tokens
+        i = self.cur_token_idx
+        token_kind = tokens[i].kind
+        if token_kind == TokenType.IFX:
+            self.cur_token_idx = i + 1
             cond = self._parse_or()
-            self._expect(TokenType.THN)
+            i = self.cur_token_idx
+            if tokens[i].kind != TokenType.THN:
+                self._error()
+            self.cur_token_idx = i + 1
             e0 = self._parse_expression()
-            self._expect(TokenType.ELS)
+            i = self.cur_token_idx
+            if tokens[i].kind != TokenType.ELS:
+                self._error()
+            self.cur_token_idx = i + 1
             e1 = self._parse_expression()
             return IfThenElse(cond, e0, e1)
-        if self._current().kind == TokenType.FNX:
+        if token_kind == TokenType.FNX:
             return self._parse_lambda()
         return self._parse_or()
 
     def _parse_or(self):
+        tokens = self.tokens
         left = self._parse_and()
-        while self._current().kind == TokenType.ORX:
-            self._advance()
+        i = self.cur_token_idx
+        while tokens[i].kind == TokenType.ORX:
+            self.cur_token_idx = i + 1
             right = self._parse_and()
             left = Or(left, right)
+            i = self.cur_token_idx
         return left
 
     def _parse_and(self):
+        tokens = self.tokens
         left = self._parse_equality()
-        while self._current().kind == TokenType.AND:
-            self._advance()
+        i = self.cur_token_idx
+        while tokens[i].kind == TokenType.AND:
+            self.cur_token_idx = i + 1
             right = self._parse_equality()
             left = And(left, right)
+            i = self.cur_token_idx
         return left
 
     def _parse_let(self):
-        self._expect(TokenType.LET)
-        identifier = self._expect(TokenType.VAR).text
-        self._expect(TokenType.ASN)
+        tokens = self.tokens
+        i = self.cur_token_idx
+        if tokens[i].kind != TokenType.LET:
+            self._error()
+        token = tokens[i + 1]
+        if token.kind != TokenType.VAR:
+            self._error()
+        if tokens[i + 2].kind != TokenType.ASN:
+            self._error()
+        identifier = token.text
+        self.cur_token_idx = i + 3
         exp_def = self._parse_expression()
-        self._expect(TokenType.INX)
+        i = self.cur_token_idx
+        if tokens[i].kind != TokenType.INX:
+            self._error()
+        self.cur_token_idx = i + 1
         exp_body = self._parse_expression()
-        self._expect(TokenType.END)
+        i = self.cur_token_idx
+        if tokens[i].kind != TokenType.END:
+            self._error()
+        self.cur_token_idx = i + 1
         return Let(identifier, exp_def, exp_body)
 
     def _parse_lambda(self):
-        self._expect(TokenType.FNX)
-        formal = self._expect(TokenType.VAR).text
-        self._expect(TokenType.ARW)
+        tokens = self.tokens
+        i = self.cur_token_idx
+        if tokens[i].kind != TokenType.FNX:
+            self._error()
+        token = tokens[i + 1]
+        if token.kind != TokenType.VAR:
+            self._error()
+        if tokens[i + 2].kind != TokenType.ARW:
+            self._error()
+        formal = token.text
+        self.cur_token_idx = i + 3
         body = self._parse_expression()
         return Fn(formal, body)
 
     def _parse_equality(self):
+        tokens = self.tokens
         left = self._parse_comparison()
-        while self._current().kind == TokenType.EQL:
-            self._advance()
+        i = self.cur_token_idx
+        while tokens[i].kind == TokenType.EQL:
+            self.cur_token_idx = i + 1
             right = self._parse_comparison()
             left = Eql(left, right)
+            i = self.cur_token_idx
         return left
 
     def _parse_comparison(self):
+        tokens = self.tokens
         left = self._parse_additive()
         while True:
-            token_kind = self._current().kind
+            i = self.cur_token_idx
+            token_kind = tokens[i].kind
             if token_kind == TokenType.LEQ:
-                self._advance()
+                self.cur_token_idx = i + 1
                 right = self._parse_additive()
                 left = Leq(left, right)
             elif token_kind == TokenType.LTH:
-                self._advance()
+                self.cur_token_idx = i + 1
                 right = self._parse_additive()
                 left = Lth(left, right)
             else:
@@ -292,28 +341,25 @@ class Parser:
         return left
 
     def _parse_application(self):
+        tokens = self.tokens
         left = self._parse_multiplicative()
-        while self._is_application_start():
+        while tokens[self.cur_token_idx].kind in _APPLICATION_START:
             right = self._parse_multiplicative()
             left = App(left, right)
         return left
 
-    def _is_application_start(self):
-        token_kind = self._current().kind
-        return token_kind in [TokenType.NUM, TokenType.TRU, TokenType.FLS, 
-                             TokenType.VAR, TokenType.LPR, TokenType.LET, TokenType.FNX, 
-                             TokenType.NEG, TokenType.NOT]
-
     def _parse_additive(self):
+        tokens = self.tokens
         left = self._parse_application()
         while True:
-            token_kind = self._current().kind
+            i = self.cur_token_idx
+            token_kind = tokens[i].kind
             if token_kind == TokenType.ADD:
-                self._advance()
+                self.cur_token_idx = i + 1
                 right = self._parse_application()
                 left = Add(left, right)
             elif token_kind == TokenType.SUB:
-                self._advance()
+                self.cur_token_idx = i + 1
                 right = self._parse_application()
                 left = Sub(left, right)
             else:
@@ -321,15 +367,17 @@ class Parser:
         return left
 
     def _parse_multiplicative(self):
+        tokens = self.tokens
         left = self._parse_unary()
         while True:
-            token_kind = self._current().kind
+            i = self.cur_token_idx
+            token_kind = tokens[i].kind
             if token_kind == TokenType.MUL:
-                self._advance()
+                self.cur_token_idx = i + 1
                 right = self._parse_unary()
                 left = Mul(left, right)
             elif token_kind == TokenType.DIV:
-                self._advance()
+                self.cur_token_idx = i + 1
                 right = self._parse_unary()
                 left = Div(left, right)
             else:
@@ -337,42 +385,50 @@ class Parser:
         return left
 
     def _parse_unary(self):
-        token_kind = self._current().kind
+        tokens = self.tokens
+        i = self.cur_token_idx
+        token_kind = tokens[i].kind
         if token_kind == TokenType.NEG:
-            self._advance()
-            token_kind = self._current().kind
-            if token_kind == TokenType.IFX:
+            i += 1
+            if tokens[i].kind == TokenType.IFX:
                 self._error()
+            self.cur_token_idx = i
             return Neg(self._parse_unary())
         if token_kind == TokenType.NOT:
-            self._advance()
+            self.cur_token_idx = i + 1
             return Not(self._parse_unary())
         return self._parse_primary()
 
     def _parse_primary(self):
-        token = self._current()
-        if token.kind == TokenType.NUM:
-            self._advance()
+        tokens = self.tokens
+        i = self.cur_token_idx
+        token = tokens[i]
+        token_kind = token.kind
+        if token_kind == TokenType.NUM:
+            self.cur_token_idx = i + 1
             return Num(int(token.text))
-        if token.kind == TokenType.TRU:
-            self._advance()
+        if token_kind == TokenType.TRU:
+            self.cur_token_idx = i + 1
             return Bln(True)
-        if token.kind == TokenType.FLS:
-            self._advance()
+        if token_kind == TokenType.FLS:
+            self.cur_token_idx = i + 1
             return Bln(False)
-        if token.kind == TokenType.VAR:
-            self._advance()
+        if token_kind == TokenType.VAR:
+            self.cur_token_idx = i + 1
             return Var(token.text)
-        if token.kind == TokenType.LPR:
-            self._advance()
+        if token_kind == TokenType.LPR:
+            self.cur_token_idx = i + 1
             expr = self._parse_expression()
-            self._expect(TokenType.RPR)
+            i = self.cur_token_idx
+            if tokens[i].kind != TokenType.RPR:
+                self._error()
+            self.cur_token_idx = i + 1
             return expr
-        if token.kind == TokenType.LET:
+        if token_kind == TokenType.LET:
             return self._parse_let()
-        if token.kind == TokenType.FNX:
+        if token_kind == TokenType.FNX:
             return self._parse_lambda()
-        if token.kind == TokenType.IFX:
+        if token_kind == TokenType.IFX:
             return self._parse_expression()
         self._error()
 